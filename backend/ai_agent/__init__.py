@@ -1,4 +1,3 @@
-from ai_agent.route import router as agent_router
-from ai_agent.tools import get_spending_summary
+from ai_agent.route import router as agent_router, load_agent_runtime
 
-__all__ = ["agent_router", "get_spending_summary"]
+__all__ = ["agent_router", "load_agent_runtime"]
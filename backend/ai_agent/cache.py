@@ -0,0 +1,22 @@
+from uuid import UUID
+from app import Settings, get_settings, TTLCache
+
+settings: Settings = get_settings()
+
+# (user id, normalised message, user data version) -> final agent answer.
+# A write bumps the data version, so stale answers are never looked up
+# again and simply age out of the LRU.
+AgentCacheKey = tuple[UUID, str, int]
+
+agent_response_cache: TTLCache[AgentCacheKey, str] = TTLCache(
+    maxsize=settings.agent_cache_size, ttl=settings.agent_cache_ttl
+)
+
+
+def normalise_message(message: str) -> str:
+    """case, whitespace and trailing punctuation don't change the question"""
+    return " ".join(message.lower().split()).rstrip(" ?!.")
+
+
+def agent_cache_key(user_id: UUID, message: str, data_version: int) -> AgentCacheKey:
+    return user_id, normalise_message(message), data_version
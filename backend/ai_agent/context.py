@@ -0,0 +1,156 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+from sqlmodel import select, func, col, and_, case
+from app import AsyncSession, current_month_bounds, get_settings, Settings
+from models import (
+    User,
+    Expenses,
+    Category,
+    Budget,
+    MonthlySpend,
+    normalize_category_name,
+)
+from services import sum_cents, forecast_month_end
+
+settings: Settings = get_settings()
+
+# get_top_expenses returns at most this many rows and says so when asked for
+# more; its docstring (the tool description the model sees) states it too
+TOP_EXPENSES_CAP = 25
+
+
+@dataclass
+class CategorySpend:
+    category_id: UUID
+    name: str
+    # amounts in integer cents, see models.money
+    monthly_limit_cents: int | None
+    spent_total_cents: int
+    spent_this_month_cents: int
+
+
+@dataclass
+class TopExpense:
+    amount_cents: int
+    category_name: str | None
+    note: str | None
+
+
+@dataclass
+class FinancialSnapshot:
+    """
+    Everything the agent tools read about a user, loaded once per agent run
+    with two queries: per-category spend (all time and this month, from the
+    monthly rollup) joined with budgets, and this month's largest expenses.
+    """
+
+    month: datetime
+    categories: list[CategorySpend]
+    top_expenses: list[TopExpense]
+
+    @property
+    def budgets(self) -> list[CategorySpend]:
+        return [c for c in self.categories if c.monthly_limit_cents is not None]
+
+    def find_category(self, name: str) -> CategorySpend | None:
+        wanted = normalize_category_name(name)
+        return next(
+            (c for c in self.categories if normalize_category_name(c.name) == wanted),
+            None,
+        )
+
+    @classmethod
+    async def load(cls, session: AsyncSession, user_id: UUID) -> "FinancialSnapshot":
+        start, end = current_month_bounds()
+
+        spend_rows = (
+            await session.exec(
+                select(
+                    Category.id,
+                    Category.name,
+                    Budget.monthly_limit_cents,
+                    func.coalesce(sum_cents(MonthlySpend.total_cents), 0),
+                    func.coalesce(
+                        sum_cents(
+                            case(
+                                (
+                                    col(MonthlySpend.month) == start.date(),
+                                    MonthlySpend.total_cents,
+                                ),
+                                else_=0,
+                            )
+                        ),
+                        0,
+                    ),
+                )
+                .join(Budget, col(Budget.category_id) == Category.id, isouter=True)
+                .join(
+                    MonthlySpend,
+                    and_(
+                        col(MonthlySpend.category_id) == Category.id,
+                        col(MonthlySpend.user_id) == user_id,
+                    ),
+                    isouter=True,
+                )
+                .where(Category.user_id == user_id)
+                .group_by(col(Category.id), Category.name, Budget.monthly_limit_cents)
+                .order_by(Category.name)
+            )
+        ).all()
+
+        top_rows = (
+            await session.exec(
+                select(Expenses.amount_cents, Category.name, Expenses.note)
+                .join(Category, col(Category.id) == Expenses.category_id, isouter=True)
+                .where(
+                    Expenses.user_id == user_id,
+                    col(Expenses.date) >= start,
+                    col(Expenses.date) < end,
+                )
+                .order_by(col(Expenses.amount_cents).desc())
+                .limit(TOP_EXPENSES_CAP)
+            )
+        ).all()
+
+        return cls(
+            month=start,
+            categories=[CategorySpend(*row) for row in spend_rows],
+            top_expenses=[TopExpense(*row) for row in top_rows],
+        )
+
+
+@dataclass
+class AgentContext:
+    user: User
+    session: AsyncSession
+    _snapshot: FinancialSnapshot | None = field(default=None, init=False)
+    _forecast: dict[str, Any] | None = field(default=None, init=False)
+    # tools may run concurrently, and an AsyncSession must not be shared by
+    # concurrent queries, so only one of them loads the snapshot / forecast
+    _snapshot_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+
+    async def snapshot(self) -> FinancialSnapshot:
+        async with self._snapshot_lock:
+            if self._snapshot is None:
+                self._snapshot = await FinancialSnapshot.load(
+                    self.session, self.user.id
+                )
+                # the tools only read the snapshot from here on, so hand the
+                # connection back to the pool for the rest of the (slow) run
+                await self.session.rollback()
+        return self._snapshot
+
+    async def forecast(self) -> dict[str, Any]:
+        """end-of-month projection (see services.forecast), loaded on first use"""
+        async with self._snapshot_lock:
+            if self._forecast is None:
+                self._forecast = await forecast_month_end(
+                    self.session,
+                    self.user.id,
+                    history_months=settings.forecast_history_months,
+                )
+                await self.session.rollback()
+        return self._forecast
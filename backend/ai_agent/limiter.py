@@ -0,0 +1,130 @@
+import asyncio
+from math import ceil
+from time import monotonic
+from uuid import UUID
+from app import Settings, get_settings, raise_429_exception, raise_503_exception
+
+settings: Settings = get_settings()
+
+
+class RunPermit:
+    """a held agent run slot; release() is safe to call more than once"""
+
+    def __init__(self, limiter: "AgentRunLimiter", user_id: UUID):
+        self._limiter = limiter
+        self._user_id = user_id
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter._release(self._user_id, running=True)
+
+
+class AgentRunLimiter:
+    """
+    Caps concurrent agent runs per worker (`max_concurrent`) and per user
+    (`per_user`, counting runs that are still queued). Up to `max_queue` runs
+    wait for a free slot, FIFO, for at most `queue_timeout` seconds; anything
+    beyond that is rejected straight away instead of piling up on the llm api
+    and the database pool.
+    """
+
+    def __init__(
+        self, max_concurrent: int, per_user: int, max_queue: int, queue_timeout: float
+    ):
+        self.max_concurrent = max_concurrent
+        self.per_user = per_user
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.running = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_per_user = 0
+        self.timed_out = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._users: dict[UUID, int] = {}
+
+    def _release(self, user_id: UUID, running: bool) -> None:
+        remaining = self._users.get(user_id, 1) - 1
+        if remaining > 0:
+            self._users[user_id] = remaining
+        else:
+            self._users.pop(user_id, None)
+
+        if running:
+            self.running -= 1
+            self._slots.release()
+
+    async def acquire(self, user_id: UUID) -> RunPermit:
+        """
+        Wait for a run slot. Raises 429 when the user already has
+        `per_user` runs, 503 when the queue is full or the wait times out.
+        """
+        if self._users.get(user_id, 0) >= self.per_user:
+            self.rejected_per_user += 1
+            raise raise_429_exception(
+                retry_after=1,
+                detail="You already have a question in progress, please wait for it",
+            )
+
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise raise_503_exception(
+                detail="The assistant is busy, please try again shortly",
+                retry_after=ceil(self.queue_timeout),
+            )
+
+        self._users[user_id] = self._users.get(user_id, 0) + 1
+        self.waiting += 1
+        started = monotonic()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._slots.acquire()
+        except TimeoutError:
+            self._release(user_id, running=False)
+            self.timed_out += 1
+            raise raise_503_exception(
+                detail="The assistant is busy, please try again shortly",
+                retry_after=ceil(self.queue_timeout),
+            )
+        except BaseException:
+            self._release(user_id, running=False)
+            raise
+        finally:
+            self.waiting -= 1
+
+        waited = monotonic() - started
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        self.running += 1
+        self.admitted += 1
+        return RunPermit(self, user_id)
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "running": self.running,
+            "queue_depth": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "per_user": self.per_user,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_per_user": self.rejected_per_user,
+            "timed_out": self.timed_out,
+            "wait_seconds_avg": (
+                self.wait_seconds_total / self.admitted if self.admitted else 0.0
+            ),
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+
+agent_run_limiter = AgentRunLimiter(
+    max_concurrent=settings.agent_max_concurrent_runs,
+    per_user=settings.agent_max_runs_per_user,
+    max_queue=settings.agent_max_queued_runs,
+    queue_timeout=settings.agent_queue_timeout,
+)
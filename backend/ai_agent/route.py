@@ -1,29 +1,50 @@
-from fastapi import APIRouter, Depends
-from agents import Agent, Runner, OpenAIChatCompletionsModel, set_tracing_disabled
-from openai import AsyncOpenAI
+import asyncio
+import importlib
+import json
+from collections.abc import AsyncIterator
+from types import ModuleType
+from typing import TYPE_CHECKING
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from app import Settings, get_settings, AsyncSession, get_session
-from .tools import (
-    get_spending_summary,
-    get_budget_status,
-    get_top_expenses,
-    can_afford_suggestion,
-    AgentContext,
+from app import (
+    Settings,
+    get_settings,
+    AsyncSession,
+    get_read_session,
+    raise_503_exception,
 )
+from .cache import agent_response_cache, agent_cache_key, AgentCacheKey
+from .context import AgentContext
+from .limiter import agent_run_limiter, RunPermit
 from models import User
 from auth import get_current_user
+from services import get_data_version
+
+if TYPE_CHECKING:
+    from agents import RunResultStreaming
 
-set_tracing_disabled(True)
 router = APIRouter(prefix="/agent", tags=["agent"])
 settings: Settings = get_settings()
 
-external_client = AsyncOpenAI(
-    api_key=settings.gemini_api_key, base_url=settings.gemini_base_url
-)
+# how often a streaming run checks whether the client is still there
+DISCONNECT_POLL_SECONDS = 0.5
+
+_runtime: ModuleType | None = None
 
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash", openai_client=external_client
-)
+
+async def load_agent_runtime() -> ModuleType:
+    """
+    `ai_agent.runtime` (agents SDK, openai client, the finance agent),
+    imported on first use. The import takes seconds, so it runs in a thread
+    instead of stalling every other request on the event loop.
+    """
+    global _runtime
+    if _runtime is None:
+        # concurrent first callers wait on the import lock, not a second import
+        _runtime = await asyncio.to_thread(importlib.import_module, "ai_agent.runtime")
+    return _runtime
 
 
 class AgentRequest(BaseModel):
@@ -37,58 +58,166 @@ class AgentRequest(BaseModel):
 async def chat(
     request: AgentRequest,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
+    # answers only depend on the user's data, so a repeat question against
+    # an unchanged data version is served without calling the model
+    data_version = await get_data_version(session, current_user.id)
+    cache_key = agent_cache_key(current_user.id, request.message, data_version)
+    cached = agent_response_cache.get(cache_key)
+    if cached is not None:
+        return {"agent_response": cached, "cached": True}
+
+    # don't sit on a pooled connection while queued and while the model thinks
+    await session.rollback()
+    permit = await agent_run_limiter.acquire(current_user.id)
+
     context = AgentContext(user=current_user, session=session)
 
-    agent = Agent(
-        name="Smart Agent",
-        instructions="""
-You are a smart personal finance assistant built into a finance tracker application.
-You help users understand and manage their financial data including expenses, categories, and budgets.
-
-## Your Identity
-- Name: Finance AI Assistant
-- You are friendly, concise, and financially knowledgeable
-- You always respond based on the user's actual data — never make up numbers
-
-## Tools Available to You
-
-### 1. get_spending_summary(category_name)
-- Use this when the user asks how much they have spent in a specific category
-- Examples: "How much did I spend on food?", "What's my total spending on transport?"
-- Always use the exact category name the user provides
-
-### 2. get_budget_status()
-- Use this when the user asks about their budget health, overspending, or which categories are over/under budget
-- Examples: "Am I over budget?", "How are my budgets looking?", "Which categories are overspent?"
-- Returns categories grouped as: over budget, approaching limit (80%+), and within budget
-
-### 3. get_top_expenses(limit)
-- Use this when the user asks about their biggest purchases or largest expenses this month
-- Examples: "What are my top expenses?", "What did I spend the most on?", "Show my biggest purchases"
-- limit is optional, defaults to 5
-
-### 4. can_afford_suggestion(item_name, item_price)
-- Use this when the user asks if they can afford something or where they are spending
-- Examples: "Can I afford a Samsung S26 Ultra?", "Should I buy a $500 jacket?", "Where am I spending?", "Do I have money left?"
-- Always extract the item name and price from the user's message before calling this tool
-- If the user doesn't mention a price, ask them for the price before calling the tool
-
-## How to Behave
-- If the user asks about spending in a category, always call the appropriate tool — do not guess
-- If a tool returns no data, inform the user clearly and suggest they add expenses or categories first
-- If the user's question is not related to their finances, politely redirect them
-- Keep responses short and to the point unless the user asks for detail
-- When showing amounts, always format as currency (e.g. $25.00)
-- More tools will be added over time — only use tools that are listed above
-""",
-        model=model,
-        tools=[get_spending_summary, get_budget_status, get_top_expenses, can_afford_suggestion],  # type: ignore
-    )
+    try:
+        runtime = await load_agent_runtime()
+        async with asyncio.timeout(settings.agent_run_timeout):
+            result = await runtime.run(request.message, context)
+    except TimeoutError:
+        raise raise_503_exception(
+            detail="The assistant took too long to answer, please try again",
+            retry_after=1,
+        )
+    finally:
+        permit.release()
+
+    agent_response_cache.set(cache_key, result.final_output)
+
+    return {"agent_response": result.final_output, "cached": False}
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _watch_run(http_request: Request, result: "RunResultStreaming") -> bool:
+    """
+    Cancel the streamed run when the client goes away or the run timeout
+    passes; returns True when it was cut off by the timeout. The model can
+    think for a while without us sending anything, so a dropped connection
+    would otherwise only be noticed on the next write.
+    """
+    deadline = asyncio.get_running_loop().time() + settings.agent_run_timeout
+    while not result.is_complete:
+        if await http_request.is_disconnected():
+            result.cancel()
+            return False
+        if asyncio.get_running_loop().time() >= deadline:
+            result.cancel()
+            return True
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+    return False
+
+
+async def _cached_events(answer: str) -> AsyncIterator[str]:
+    yield _sse("delta", {"text": answer})
+    yield _sse("done", {"cached": True})
+
+
+async def _stream_events(
+    http_request: Request,
+    message: str,
+    user: User,
+    cache_key: AgentCacheKey,
+    permit: RunPermit,
+) -> AsyncIterator[str]:
+    # the request-scoped session may be closed before the response finishes
+    # streaming, so the run owns its own session for the whole stream
+    try:
+        runtime = await load_agent_runtime()
+        async with http_request.app.state.async_read_session() as session:
+            result = runtime.run_streamed(
+                message, AgentContext(user=user, session=session)
+            )
+            watcher = asyncio.create_task(_watch_run(http_request, result))
+            tool_names: dict[str, str] = {}
+
+            try:
+                async for event in result.stream_events():
+                    if event.type == "raw_response_event":
+                        if event.data.type == "response.output_text.delta":
+                            yield _sse("delta", {"text": event.data.delta})
+
+                    elif event.type == "run_item_stream_event":
+                        raw = event.item.raw_item
+                        if event.name == "tool_called":
+                            name = getattr(raw, "name", None) or "tool"
+                            tool_names[getattr(raw, "call_id", "")] = name
+                            yield _sse("tool_call", {"tool": name})
+                        elif event.name == "tool_output":
+                            call_id = (
+                                raw.get("call_id") if isinstance(raw, dict) else None
+                            )
+                            yield _sse(
+                                "tool_result",
+                                {"tool": tool_names.get(call_id, "tool")},
+                            )
+            except Exception:
+                yield _sse("error", {"detail": "The assistant failed to answer"})
+                return
+            finally:
+                # also reached when the client goes away mid-stream and the
+                # generator is cancelled / closed: stop the run and its llm calls
+                if not result.is_complete:
+                    result.cancel()
+                if not watcher.done():
+                    watcher.cancel()
+
+            if watcher.done() and not watcher.cancelled() and watcher.result():
+                yield _sse(
+                    "error",
+                    {
+                        "detail": "The assistant took too long to answer, please try again"
+                    },
+                )
+                return
+
+            if result.final_output is not None:
+                agent_response_cache.set(cache_key, result.final_output)
+            yield _sse("done", {"cached": False})
+    finally:
+        permit.release()
 
-    result = await Runner.run(
-        starting_agent=agent, input=request.message, context=context
-    )
 
-    return {"agent_response": result.final_output}
+@router.post(
+    path="/stream",
+    description=(
+        "Chat with the finance AI Agent over server-sent events: `delta` events "
+        "carry answer text as it is generated, `tool_call` / `tool_result` report "
+        "tool progress, and `done` ends the stream"
+    ),
+)
+async def stream(
+    request: AgentRequest,
+    http_request: Request,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    data_version = await get_data_version(session, current_user.id)
+    cache_key = agent_cache_key(current_user.id, request.message, data_version)
+    cached = agent_response_cache.get(cache_key)
+    if cached is not None:
+        return StreamingResponse(
+            _cached_events(cached),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    # the stream runs on its own session; free this one's connection now.
+    # Taking the slot before the response starts lets a full queue answer
+    # with a plain 503 instead of an error event.
+    await session.rollback()
+    permit = await agent_run_limiter.acquire(current_user.id)
+
+    return StreamingResponse(
+        _stream_events(http_request, request.message, current_user, cache_key, permit),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # releases the slot if the stream never started (release is idempotent)
+        background=BackgroundTask(permit.release),
+    )
@@ -1,16 +1,10 @@
-from dataclasses import dataclass
 from agents import function_tool, RunContextWrapper
-from sqlmodel import select, func
-from models import User, Expenses, Category, Budget
-from app import AsyncSession
-from datetime import datetime
-from sqlmodel import col as _col
+from models import to_cents, from_cents
+from .context import TOP_EXPENSES_CAP, AgentContext
 
 
-@dataclass
-class AgentContext:
-    user: User
-    session: AsyncSession
+def _dollars(cents: int) -> str:
+    return f"${from_cents(cents):.2f}"
 
 
 @function_tool
@@ -23,32 +17,15 @@ async def get_spending_summary(
     Args:
         category_name: The name of the category to get spending summary for
     """
-    session = ctx.context.session
-    user = ctx.context.user
-
-    category = (
-        await session.exec(
-            select(Category).where(
-                func.lower(Category.name) == category_name.lower(),
-                Category.user_id == user.id,
-            )
-        )
-    ).first()
+    snapshot = await ctx.context.snapshot()
+    category = snapshot.find_category(category_name)
 
     if not category:
         return f"No category found with the name '{category_name}'."
 
-    total = (
-        await session.exec(
-            select(func.sum(Expenses.amount)).where(
-                Expenses.category_id == category.id,
-                Expenses.user_id == user.id,
-            )
-        )
-    ).one()
-
-    spent = total or 0.0
-    return f"Total spending in '{category.name}': ${spent:.2f}"
+    return (
+        f"Total spending in '{category.name}': {_dollars(category.spent_total_cents)}"
+    )
 
 
 @function_tool
@@ -57,12 +34,7 @@ async def get_budget_status(ctx: RunContextWrapper[AgentContext]):
     Check which categories are over budget, approaching the limit, or within budget.
     Use this when the user asks about their budget status, overspending, or budget health.
     """
-    session = ctx.context.session
-    user = ctx.context.user
-
-    budgets = (
-        await session.exec(select(Budget).where(Budget.user_id == user.id))
-    ).all()
+    budgets = (await ctx.context.snapshot()).budgets
 
     if not budgets:
         return "You have no budgets set. Create a budget for a category first."
@@ -70,31 +42,20 @@ async def get_budget_status(ctx: RunContextWrapper[AgentContext]):
     over, approaching, ok = [], [], []
 
     for budget in budgets:
-        category = await session.get(Category, budget.category_id)
-        category_name = category.name if category else str(budget.category_id)
-
-        total = (
-            await session.exec(
-                select(func.sum(Expenses.amount)).where(
-                    Expenses.category_id == budget.category_id,
-                    Expenses.user_id == user.id,
-                )
-            )
-        ).one()
-
-        spent = total or 0.0
-        limit = budget.monthly_limit
+        category_name = budget.name
+        limit, spent = budget.monthly_limit_cents, budget.spent_total_cents
+
         remaining = limit - spent
         pct = (spent / limit * 100) if limit > 0 else 0
 
-        entry = f"- {category_name}: spent ${spent:.2f} of ${limit:.2f} ({pct:.0f}%)"
+        entry = f"- {category_name}: spent {_dollars(spent)} of {_dollars(limit)} ({pct:.0f}%)"
 
         if spent > limit:
-            over.append(f"{entry} — OVER by ${abs(remaining):.2f}")
+            over.append(f"{entry} — OVER by {_dollars(abs(remaining))}")
         elif pct >= 80:
-            approaching.append(f"{entry} — only ${remaining:.2f} left")
+            approaching.append(f"{entry} — only {_dollars(remaining)} left")
         else:
-            ok.append(f"{entry} — ${remaining:.2f} remaining")
+            ok.append(f"{entry} — {_dollars(remaining)} remaining")
 
     lines = []
     if over:
@@ -114,35 +75,25 @@ async def get_top_expenses(ctx: RunContextWrapper[AgentContext], limit: int = 5)
     Use this when the user asks about their largest purchases, biggest spending, or top expenses this month.
 
     Args:
-        limit: Number of top expenses to return. Defaults to 5.
+        limit: Number of top expenses to return. Defaults to 5, at most 25.
     """
 
-    session = ctx.context.session
-    user = ctx.context.user
-    now = datetime.now()
-
-    expenses = (
-        await session.exec(
-            select(Expenses)
-            .where(
-                Expenses.user_id == user.id,
-                func.extract("month", _col(Expenses.date)) == now.month,
-                func.extract("year", _col(Expenses.date)) == now.year,
-            )
-            .order_by(_col(Expenses.amount).desc())
-            .limit(limit)
-        )
-    ).all()
+    snapshot = await ctx.context.snapshot()
+    expenses = snapshot.top_expenses[: max(min(limit, TOP_EXPENSES_CAP), 0)]
 
     if not expenses:
         return "You have no expenses recorded for this month."
 
     lines = [f"Your top {len(expenses)} expense(s) this month:"]
+    if limit > TOP_EXPENSES_CAP:
+        lines[0] = (
+            f"Showing only the top {len(expenses)} expense(s) this month; "
+            f"this tool returns at most {TOP_EXPENSES_CAP}, not the {limit} asked for:"
+        )
     for i, expense in enumerate(expenses, start=1):
-        category = await session.get(Category, expense.category_id)
-        category_name = category.name if category else "Uncategorized"
+        category_name = expense.category_name or "Uncategorized"
         note = f" — {expense.note}" if expense.note else ""
-        lines.append(f"{i}. ${expense.amount:.2f} in {category_name}{note}")
+        lines.append(f"{i}. {_dollars(expense.amount_cents)} in {category_name}{note}")
 
     return "\n".join(lines)
 
@@ -163,78 +114,81 @@ async def can_afford_suggestion(
         item_name: The name of the item the user wants to buy (e.g. "Samsung S26 Ultra")
         item_price: The price of the item in dollars (e.g. 1200.0)
     """
-    session = ctx.context.session
-    user = ctx.context.user
-    now = datetime.now()
-
-    # Get all budgets and calculate remaining for each category
-    budgets = (
-        await session.exec(select(Budget).where(Budget.user_id == user.id))
-    ).all()
-
-    total_budget = 0.0
-    total_spent_this_month = 0.0
+    snapshot = await ctx.context.snapshot()
+    # the same end-of-month projection as GET /budget/forecast
+    forecast = {
+        entry["category_id"]: entry["forecast_cents"]
+        for entry in (await ctx.context.forecast())["categories"]
+    }
+
+    # all sums and comparisons in integer cents
+    item_price_cents = to_cents(item_price)
+    total_budget = 0
+    total_spent_this_month = 0
+    total_forecast = 0
     category_breakdown = []
 
-    for budget in budgets:
-        category = await session.get(Category, budget.category_id)
-        category_name = category.name if category else "Unknown"
-
-        spent = (
-            await session.exec(
-                select(func.sum(Expenses.amount)).where(
-                    Expenses.category_id == budget.category_id,
-                    Expenses.user_id == user.id,
-                    func.extract("month", _col(Expenses.date)) == now.month,
-                    func.extract("year", _col(Expenses.date)) == now.year,
-                )
-            )
-        ).one() or 0.0
-
-        remaining = budget.monthly_limit - spent
-        total_budget += budget.monthly_limit
+    for budget in snapshot.budgets:
+        category_name = budget.name
+        monthly_limit, spent = budget.monthly_limit_cents, budget.spent_this_month_cents
+        projected = forecast.get(budget.category_id, spent)
+
+        remaining = monthly_limit - spent
+        total_budget += monthly_limit
         total_spent_this_month += spent
+        total_forecast += projected
         category_breakdown.append(
-            f"  - {category_name}: ${remaining:.2f} remaining of ${budget.monthly_limit:.2f}"
+            f"  - {category_name}: {_dollars(remaining)} remaining of {_dollars(monthly_limit)}"
+            f" (projected {_dollars(projected)} by month end)"
         )
 
     total_remaining = total_budget - total_spent_this_month
+    # what should be left once the rest of the month's usual spending is in
+    expected_left = total_budget - total_forecast
 
     # Build the response
     lines = [
-        f"Here's your financial snapshot for {now.strftime('%B %Y')}:",
-        f"  Total budget:  ${total_budget:.2f}",
-        f"  Spent so far:  ${total_spent_this_month:.2f}",
-        f"  Remaining:     ${total_remaining:.2f}",
+        f"Here's your financial snapshot for {snapshot.month.strftime('%B %Y')}:",
+        f"  Total budget:  {_dollars(total_budget)}",
+        f"  Spent so far:  {_dollars(total_spent_this_month)}",
+        f"  Remaining:     {_dollars(total_remaining)}",
+        f"  Projected spending by month end: {_dollars(total_forecast)}",
+        f"  Expected left at month end:      {_dollars(expected_left)}",
     ]
 
     if category_breakdown:
         lines.append("\nBy category:")
         lines.extend(category_breakdown)
 
-    lines.append(f"\nItem: {item_name} — ${item_price:.2f}")
+    lines.append(f"\nItem: {item_name} — {_dollars(item_price_cents)}")
 
     if total_remaining <= 0:
         lines.append(
             "\nVerdict: You've already used up your entire budget this month. "
             "It's not a good time to make this purchase."
         )
-    elif item_price > total_remaining:
-        shortage = item_price - total_remaining
+    elif expected_left <= 0:
+        lines.append(
+            "\nVerdict: At your usual pace you'll go over your budget by "
+            f"{_dollars(-expected_left)} this month even without {item_name}. "
+            "It's not a good time to make this purchase."
+        )
+    elif item_price_cents > expected_left:
+        shortage = item_price_cents - expected_left
         lines.append(
             f"\nVerdict: You can't comfortably afford {item_name} right now. "
-            f"You're ${shortage:.2f} short based on your remaining budget."
+            f"You're {_dollars(shortage)} short of what your budget is expected to have left by the end of the month."
         )
-    elif item_price > total_remaining * 0.5:
+    elif item_price_cents * 2 > expected_left:
         lines.append(
             f"\nVerdict: You could technically afford {item_name}, but it would use "
-            f"{(item_price / total_remaining * 100):.0f}% of your remaining budget. "
+            f"{(item_price_cents / expected_left * 100):.0f}% of what your budget is expected to have left this month. "
             "Consider whether it's worth it this month."
         )
     else:
         lines.append(
             f"\nVerdict: Yes, you can afford {item_name}! "
-            f"You'll still have ${total_remaining - item_price:.2f} left in your budget after this purchase."
+            f"You should still have {_dollars(expected_left - item_price_cents)} left in your budget at the end of the month."
         )
 
     return "\n".join(lines)
@@ -1,13 +1,64 @@
 from app.config import Settings, get_settings
-from app.database import lifespan, get_session, AsyncSession
-from app.exceptions import raise_400_exception, credential_exception
+from app.database import (
+    lifespan,
+    get_session,
+    get_read_session,
+    AsyncSession,
+    build_engine,
+    build_sessionmaker,
+)
+from app.cache import TTLCache
+from app.metrics import MetricsMiddleware, render_metrics, require_metrics_token
+from app.db_stats import (
+    QueryStats,
+    QueryStatsMiddleware,
+    current_query_stats,
+    instrument_engine,
+    query_stats_enabled,
+)
+from app.exceptions import (
+    raise_304_exception,
+    raise_400_exception,
+    raise_413_exception,
+    raise_429_exception,
+    raise_503_exception,
+    credential_exception,
+)
+from app.dates import (
+    month_bounds,
+    current_month_bounds,
+    is_calendar_month,
+    parse_month,
+    resolve_period,
+)
 
 __all__ = [
     "Settings",
     "get_settings",
     "lifespan",
     "get_session",
+    "get_read_session",
+    "build_engine",
+    "build_sessionmaker",
+    "raise_304_exception",
     "raise_400_exception",
+    "raise_413_exception",
+    "raise_429_exception",
+    "raise_503_exception",
     "AsyncSession",
     "credential_exception",
+    "TTLCache",
+    "MetricsMiddleware",
+    "render_metrics",
+    "require_metrics_token",
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "current_query_stats",
+    "instrument_engine",
+    "query_stats_enabled",
+    "month_bounds",
+    "current_month_bounds",
+    "is_calendar_month",
+    "parse_month",
+    "resolve_period",
 ]
@@ -1,9 +1,32 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
 
 class Settings(BaseSettings):
     database_url: str = ""
+    # optional read-only replica; read-heavy GET routes and the agent use it
+    database_read_url: str = ""
+
+    # connection pool, per engine and worker
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # seconds; connections older than this are replaced (-1 keeps them forever)
+    db_pool_recycle: int = 1800
+    # seconds to wait for a free connection before failing the request
+    db_pool_timeout: float = 30
+    db_pool_pre_ping: bool = True
+    # asyncpg only: connect timeout (seconds) and prepared statement cache;
+    # keep the cache at 0 behind pgbouncer in transaction pooling mode
+    db_connect_timeout: float = 10
+    db_statement_cache_size: int = 0
+
+    # debug adds X-DB-Queries / X-DB-Time headers to every response
+    debug: bool = False
+    # per-request query counting: slow query and N+1 warnings in the logs
+    query_stats_enabled: bool = False
+    slow_query_ms: float = 200
+    n_plus_one_threshold: int = 10
 
     # authentication
     secret_key: str = ""
@@ -12,6 +35,49 @@ class Settings(BaseSettings):
     refresh_access_token_expire_limit: int = 0
     refresh_token_secret_key: str = ""
 
+    # authenticated users are cached per worker for this many seconds
+    identity_cache_ttl: int = 60
+    identity_cache_size: int = 10_000
+
+    # threads running argon2 hash/verify off the event loop
+    password_hash_workers: int = 2
+
+    # token buckets in front of sign in / sign up, per client ip and per username;
+    # both must be positive, a zero refill rate would never let a client back in
+    auth_rate_limit_burst: int = Field(default=10, ge=1)
+    auth_rate_limit_per_minute: float = Field(default=10, gt=0)
+    auth_rate_limit_max_keys: int = 100_000
+    # take the client ip from X-Forwarded-For (only behind a trusted proxy)
+    trust_forwarded_for: bool = False
+
+    # per-user category name <-> id maps, cached per worker for this many seconds
+    category_cache_ttl: int = 300
+    category_cache_size: int = 10_000
+
+    # past months averaged by /budget/forecast and the agent's projections
+    # (1 to 24, the range the route's `months` parameter accepts)
+    forecast_history_months: int = Field(default=6, ge=1, le=24)
+
+    # largest CSV / JSON batch accepted by POST /expenses/import
+    expense_import_max_rows: int = 5_000
+
+    # bearer token a scraper must send to GET /metrics; while empty the
+    # endpoint is disabled (404), it exposes per-route traffic and latency
+    metrics_token: str = ""
+
+    # answers from /agent/chat, reused while the user's data is unchanged
+    agent_cache_ttl: int = 600
+    agent_cache_size: int = 5_000
+
+    # agent runs (llm calls) allowed at once per worker and per user; runs
+    # beyond that wait in a bounded queue for at most agent_queue_timeout
+    # seconds, and each run is cut off after agent_run_timeout seconds
+    agent_max_concurrent_runs: int = 20
+    agent_max_runs_per_user: int = 2
+    agent_max_queued_runs: int = 50
+    agent_queue_timeout: float = 10
+    agent_run_timeout: float = 60
+
     # llm api key
     gemini_api_key: str = ""
     gemini_base_url: str = "https://generativelanguage.googleapis.com/v1beta/openai/"
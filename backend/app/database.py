@@ -1,35 +1,82 @@
 from fastapi import FastAPI, Request
-from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from app import Settings, get_settings
+from app.metrics import pool_metrics
+from app.db_stats import instrument_engine, query_stats_enabled
 from contextlib import asynccontextmanager
 
 settings: Settings = get_settings()
 
 
+def build_engine(url: str | None = None) -> AsyncEngine:
+    url = url or settings.database_url
+    connect_args = {}
+    # asyncpg options; other drivers (e.g. aiosqlite for local benchmarks)
+    # reject them. Both statement caches have to go for pgbouncer.
+    if "+asyncpg" in url:
+        connect_args = {
+            "timeout": settings.db_connect_timeout,
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        }
+    return create_async_engine(
+        url=url,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+        connect_args=connect_args,
+    )
+
+
+def build_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Database pooling started")
-    engine = create_async_engine(
-        url=settings.database_url,
-        pool_pre_ping=True,
-        pool_size=5,
-        connect_args={"statement_cache_size": 0},
-    )
-    app.state.async_session = async_sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with engine.begin() as connection:
-        await connection.run_sync(SQLModel.metadata.create_all)
+    engine = build_engine()
+    engines = {"primary": engine}
+    app.state.engine = engine
+    app.state.async_session = build_sessionmaker(engine)
+
+    # without a replica, reads share the primary's sessions
+    app.state.async_read_session = app.state.async_session
+    if settings.database_read_url:
+        read_engine = build_engine(settings.database_read_url)
+        engines["replica"] = read_engine
+        app.state.async_read_session = build_sessionmaker(read_engine)
+    app.state.engines = engines
+
+    for name, each in engines.items():
+        pool_metrics.watch(each, name)
+        if query_stats_enabled():
+            instrument_engine(each)
+
+    # connections are opened lazily and the schema is created by
+    # `manage.py create-schema`, so boot doesn't wait on the database
     print("Database pooling created")
 
     yield
 
-    await engine.dispose()
+    for each in engines.values():
+        await each.dispose()
     print("Database closed")
 
 
 async def get_session(request: Request):
     async with request.app.state.async_session() as session:
         yield session
+
+
+async def get_read_session(request: Request):
+    """
+    Session on the read replica (the primary when none is configured). The
+    replica may lag behind a write the client just made, so only use it for
+    reads that can tolerate that.
+    """
+    async with request.app.state.async_read_session() as session:
+        yield session
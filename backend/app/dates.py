@@ -0,0 +1,73 @@
+from datetime import MAXYEAR, date, datetime, timedelta
+from app.exceptions import raise_400_exception
+
+
+def month_bounds(year: int, month: int) -> tuple[datetime, datetime]:
+    """half-open [start, end) range covering a calendar month"""
+    start = datetime(year, month, 1)
+    if month == 12:
+        return start, datetime(year + 1, 1, 1)
+    return start, datetime(year, month + 1, 1)
+
+
+def current_month_bounds() -> tuple[datetime, datetime]:
+    now = datetime.now()
+    return month_bounds(now.year, now.month)
+
+
+def is_calendar_month(start: datetime, end: datetime) -> bool:
+    """true when [start, end) is exactly one calendar month"""
+    return (
+        start.day == 1
+        and start.time() == datetime.min.time()
+        and end == month_bounds(start.year, start.month)[1]
+    )
+
+
+def parse_month(value: str) -> tuple[datetime, datetime]:
+    """parse a YYYY-MM string into its month bounds"""
+    try:
+        parsed = datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise raise_400_exception(detail="month must be in YYYY-MM format")
+    if parsed.year == MAXYEAR and parsed.month == 12:
+        # its exclusive end would be in year 10000
+        raise raise_400_exception(detail=f"month must be before {MAXYEAR}-12")
+
+    return month_bounds(parsed.year, parsed.month)
+
+
+def resolve_period(
+    month: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> tuple[datetime, datetime]:
+    """
+    Turn the month / start_date / end_date query params into a half-open
+    datetime range. end_date is inclusive. Defaults to the current month.
+    """
+    if month and (start_date or end_date):
+        raise raise_400_exception(
+            detail="Use either month or start_date/end_date, not both"
+        )
+
+    if month:
+        return parse_month(month)
+
+    if start_date or end_date:
+        if not (start_date and end_date):
+            raise raise_400_exception(
+                detail="start_date and end_date must be provided together"
+            )
+        if end_date < start_date:
+            raise raise_400_exception(detail="end_date must not be before start_date")
+        if end_date >= date.max:
+            # the exclusive end is the day after end_date
+            raise raise_400_exception(detail=f"end_date must be before {date.max}")
+
+        return (
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date + timedelta(days=1), datetime.min.time()),
+        )
+
+    return current_month_bounds()
@@ -0,0 +1,126 @@
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from time import perf_counter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import Settings, get_settings
+from app.metrics import route_template
+
+settings: Settings = get_settings()
+logger = logging.getLogger("app.db")
+
+
+class QueryStats:
+    """
+    Queries run (and time spent in the database) while this object is the
+    current one. Stats nest: a query also counts towards every parent, so a
+    test can wrap requests that each get their own stats from the middleware.
+    """
+
+    def __init__(
+        self,
+        route: str = "",
+        parent: "QueryStats | None" = None,
+        keep_statements: bool = False,
+    ):
+        self.route = route
+        self.parent = parent
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: list[str] | None = [] if keep_statements else None
+        self.repeats: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        stats: QueryStats | None = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            stats.repeats[statement] += 1
+            if stats.statements is not None:
+                stats.statements.append(statement)
+            stats = stats.parent
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("query_started", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    elapsed = perf_counter() - conn.info["query_started"].pop()
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+
+    stats.record(statement, elapsed)
+    if elapsed * 1000 >= settings.slow_query_ms:
+        logger.warning(
+            "slow query (%.1f ms) on %s: %s",
+            elapsed * 1000,
+            stats.route or "-",
+            " ".join(statement.split())[:500],
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """hook the query counters into the engine; safe to call more than once"""
+    target = engine.sync_engine
+    if event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+def query_stats_enabled() -> bool:
+    return settings.query_stats_enabled or settings.debug
+
+
+class QueryStatsMiddleware:
+    """
+    Gives every request its own QueryStats. Logs requests that repeat one
+    statement `n_plus_one_threshold` times or more (the usual N+1 shape)
+    and, in debug mode, reports the counts in X-DB-Queries / X-DB-Time
+    headers. Queries run after the headers went out (streamed bodies) are
+    only in the logs.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = f"{scope['method']} {route_template(scope)}"
+        stats = QueryStats(route=route, parent=current_query_stats.get())
+        token = current_query_stats.set(stats)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.debug:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                headers["X-DB-Time"] = f"{stats.seconds * 1000:.1f}ms"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_query_stats.reset(token)
+            if stats.repeats:
+                statement, times = stats.repeats.most_common(1)[0]
+                if times >= settings.n_plus_one_threshold:
+                    logger.warning(
+                        "possible N+1 on %s: %d queries, one statement ran %d times: %s",
+                        route,
+                        stats.count,
+                        times,
+                        " ".join(statement.split())[:500],
+                    )
@@ -1,10 +1,37 @@
 from fastapi import status, HTTPException
 
 
+def raise_304_exception(headers: dict[str, str]) -> HTTPException:
+    """not modified; the handler sends it without a body"""
+    return HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
 def raise_400_exception(detail: str) -> HTTPException:
     return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
 
+def raise_413_exception(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=detail)
+
+
+def raise_429_exception(
+    retry_after: int, detail: str = "Too many attempts, please try again later"
+) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def raise_503_exception(detail: str, retry_after: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
 def credential_exception() -> HTTPException:
     return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,5 +1,7 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
 from routes import (
     category_router,
     authentication_router,
@@ -8,7 +10,18 @@ from routes import (
     admin_router,
 )
 from ai_agent import agent_router
-from app import lifespan
+from ai_agent.cache import agent_response_cache
+from ai_agent.limiter import agent_run_limiter
+from auth import auth_rate_limiter, identity_cache
+from services import category_maps
+from app import (
+    lifespan,
+    MetricsMiddleware,
+    render_metrics,
+    require_metrics_token,
+    QueryStatsMiddleware,
+    query_stats_enabled,
+)
 
 app = FastAPI(
     title="Smart Finance Tracker API",
@@ -23,6 +36,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if query_stats_enabled():
+    app.add_middleware(QueryStatsMiddleware)
+# added last so it wraps everything, CORS preflights included
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(category_router)
 app.include_router(authentication_router)
@@ -38,5 +55,49 @@ def root() -> dict[str, str]:
 
 
 @app.get(path="/health")
-def get_health() -> dict:
-    return {"health": "running", "service": "finance_tracker_api"}
+async def get_health(request: Request):
+    databases = {}
+    for name, engine in request.app.state.engines.items():
+        try:
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+            databases[name] = "ok"
+        except Exception:
+            databases[name] = "unreachable"
+
+    if any(state != "ok" for state in databases.values()):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "health": "degraded",
+                "service": "finance_tracker_api",
+                "databases": databases,
+            },
+        )
+
+    return {
+        "health": "running",
+        "service": "finance_tracker_api",
+        "databases": databases,
+    }
+
+
+@app.get(
+    path="/metrics",
+    include_in_schema=False,
+    dependencies=[Depends(require_metrics_token)],
+)
+def get_metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(
+        render_metrics(
+            engines=request.app.state.engines,
+            components={
+                "identity_cache": identity_cache.stats(),
+                "auth_rate_limiter": auth_rate_limiter.stats(),
+                "agent_cache": agent_response_cache.stats(),
+                "agent_limiter": agent_run_limiter.stats(),
+                "category_cache": category_maps.stats(),
+            },
+        ),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -0,0 +1,268 @@
+import hmac
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Mapping
+from time import perf_counter
+from fastapi import HTTPException, Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.routing import Match
+from starlette.status import HTTP_404_NOT_FOUND
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import get_settings
+from app.exceptions import credential_exception
+
+# seconds; the top buckets are there for agent runs and long exports
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# (metric name, pool method, help)
+POOL_GAUGES = (
+    ("db_pool_size", "size", "Connections the pool keeps open."),
+    ("db_pool_checked_out", "checkedout", "Connections currently checked out."),
+    ("db_pool_overflow", "overflow", "Connections opened beyond the pool size."),
+    ("db_pool_checked_in", "checkedin", "Idle connections in the pool."),
+)
+
+# requests that match no route share one label, so scanners probing random
+# paths can't blow up the number of series
+UNMATCHED_ROUTE = "unmatched"
+
+
+class HTTPMetrics:
+    """
+    Per-route request counters, latency histograms and in-flight gauges.
+    Only plain dict / int updates happen per request; the Prometheus text is
+    built when /metrics is scraped.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # (method, route, status) -> count
+        self.requests: defaultdict[tuple[str, str, int], int] = defaultdict(int)
+        # (method, route) -> requests currently being handled
+        self.in_progress: defaultdict[tuple[str, str], int] = defaultdict(int)
+        # (method, route) -> per-bucket counts (last slot is +Inf) and sum
+        self.latency: dict[tuple[str, str], list[int]] = {}
+        self.latency_sum: defaultdict[tuple[str, str], float] = defaultdict(float)
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route)
+        self.requests[(method, route, status)] += 1
+
+        counts = self.latency.get(key)
+        if counts is None:
+            counts = self.latency[key] = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, seconds)] += 1
+        self.latency_sum[key] += seconds
+
+
+class PoolMetrics:
+    """connection checkouts / new connections per engine, from pool events"""
+
+    def __init__(self):
+        self.checkouts: Counter[str] = Counter()
+        self.connects: Counter[str] = Counter()
+
+    def watch(self, engine: AsyncEngine, name: str) -> None:
+        pool = engine.sync_engine.pool
+
+        def on_checkout(*_) -> None:
+            self.checkouts[name] += 1
+
+        def on_connect(*_) -> None:
+            self.connects[name] += 1
+
+        event.listen(pool, "checkout", on_checkout)
+        event.listen(pool, "connect", on_connect)
+
+
+http_metrics = HTTPMetrics()
+pool_metrics = PoolMetrics()
+
+
+def route_template(scope: Scope) -> str:
+    """the path template of the route the request will hit, e.g. /expenses/{id}"""
+    # several middlewares want it; match the routes once per request
+    cached = scope.get("route_template")
+    if cached is not None:
+        return cached
+
+    app = scope.get("app")
+    template = None
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            template = route.path
+            break
+        if match == Match.PARTIAL and template is None:
+            # path matched but not the method, the app answers 405
+            template = route.path
+
+    scope["route_template"] = template or UNMATCHED_ROUTE
+    return scope["route_template"]
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task / body buffering) that
+    feeds `http_metrics`. Latency runs until the last body chunk is sent, so
+    streamed responses count their full duration.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: HTTPMetrics = http_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        key = (method, route)
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.in_progress[key] += 1
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_progress[key] -= 1
+            self.metrics.observe(method, route, status, perf_counter() - started)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_bucket(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render_metrics(
+    engines: Mapping[str, AsyncEngine] | None = None,
+    components: Mapping[str, Mapping[str, int | float]] | None = None,
+) -> str:
+    """
+    Prometheus text exposition (format 0.0.4) of the http metrics, the
+    connection pools of `engines` (labelled by name), and every numeric value of the
+    `components` stats dicts as a `finance_<component>_<key>` gauge.
+    """
+    lines = [
+        "# HELP http_requests_total Requests handled, by route template and status.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), count in sorted(http_metrics.requests.items()):
+        labels = _labels(method=method, route=route, status=status)
+        lines.append(f"http_requests_total{labels} {count}")
+
+    lines += [
+        "# HELP http_requests_in_progress Requests currently being handled.",
+        "# TYPE http_requests_in_progress gauge",
+    ]
+    for (method, route), count in sorted(http_metrics.in_progress.items()):
+        lines.append(
+            f"http_requests_in_progress{_labels(method=method, route=route)} {count}"
+        )
+
+    lines += [
+        "# HELP http_request_duration_seconds Time to send the full response.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    bounds = (*http_metrics.buckets, float("inf"))
+    for (method, route), counts in sorted(http_metrics.latency.items()):
+        cumulative = 0
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            labels = _labels(method=method, route=route, le=_format_bucket(bound))
+            lines.append(f"http_request_duration_seconds_bucket{labels} {cumulative}")
+        labels = _labels(method=method, route=route)
+        total = http_metrics.latency_sum[(method, route)]
+        lines.append(f"http_request_duration_seconds_sum{labels} {total}")
+        lines.append(f"http_request_duration_seconds_count{labels} {cumulative}")
+
+    engines = engines or {}
+    for name, method, help_text in POOL_GAUGES:
+        # not every pool class (e.g. NullPool) reports these
+        values = {
+            engine_name: getattr(engine.sync_engine.pool, method, None)
+            for engine_name, engine in engines.items()
+        }
+        values = {key: value for key, value in values.items() if value is not None}
+        if not values:
+            continue
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for engine_name, value in values.items():
+            # QueuePool.overflow() counts up from -pool_size
+            lines.append(f"{name}{_labels(engine=engine_name)} {max(value(), 0)}")
+
+    if engines:
+        lines += [
+            "# HELP db_pool_checkouts_total Connections handed out by the pool.",
+            "# TYPE db_pool_checkouts_total counter",
+        ]
+        lines += [
+            f"db_pool_checkouts_total{_labels(engine=engine_name)} "
+            f"{pool_metrics.checkouts[engine_name]}"
+            for engine_name in engines
+        ]
+        lines += [
+            "# HELP db_pool_connects_total New database connections opened.",
+            "# TYPE db_pool_connects_total counter",
+        ]
+        lines += [
+            f"db_pool_connects_total{_labels(engine=engine_name)} "
+            f"{pool_metrics.connects[engine_name]}"
+            for engine_name in engines
+        ]
+
+    for component, stats in (components or {}).items():
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"finance_{component}_{key}"
+            lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+
+    return "\n".join(lines) + "\n"
+
+
+def require_metrics_token(request: Request) -> None:
+    """
+    Guard for GET /metrics: 404 unless METRICS_TOKEN is set, then the
+    request must carry it as a bearer token.
+    """
+    token = get_settings().metrics_token
+    if not token:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        credentials.strip().encode(), token.encode()
+    ):
+        raise credential_exception()
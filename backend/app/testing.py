@@ -0,0 +1,46 @@
+"""
+Helpers for tests of this app. Nothing here is used by the running API.
+
+    from app.testing import assert_query_budget
+
+    async def test_summary_query_budget(client, auth_headers):
+        with assert_query_budget(app, 3):
+            await client.get("/budget/summary", headers=auth_headers)
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from fastapi import FastAPI
+from app.db_stats import QueryStats, current_query_stats, instrument_engine
+
+
+@contextmanager
+def count_queries(app: FastAPI) -> Iterator[QueryStats]:
+    """
+    Count the queries the app runs inside the block, across requests made
+    in-process (e.g. httpx.ASGITransport). The app's lifespan must be running.
+    """
+    for engine in app.state.engines.values():
+        instrument_engine(engine)
+    stats = QueryStats(route="test", keep_statements=True)
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+@contextmanager
+def assert_query_budget(app: FastAPI, max_queries: int) -> Iterator[QueryStats]:
+    """fail when the block runs more than `max_queries` queries, listing them"""
+    with count_queries(app) as stats:
+        yield stats
+
+    if stats.count > max_queries:
+        listing = "\n".join(
+            f"  {i}. {' '.join(statement.split())[:200]}"
+            for i, statement in enumerate(stats.statements or [], start=1)
+        )
+        raise AssertionError(
+            f"{stats.count} queries ran, the budget is {max_queries}:\n{listing}"
+        )
@@ -1,20 +1,36 @@
 from auth.security import (
     encrypt_password,
     verify_password,
+    encrypt_password_async,
+    verify_password_async,
     decode_jwt_token,
     create_jwt_token,
     create_refresh_token,
     decode_refresh_jwt_token,
+    token_claims,
 )
-from auth.dependency import get_current_user, require_admin
+from auth.dependency import (
+    get_current_user,
+    require_admin,
+    identity_cache,
+    invalidate_identity,
+)
+from auth.rate_limit import auth_rate_limiter, enforce_auth_rate_limit
 
 __all__ = [
     "verify_password",
     "encrypt_password",
+    "verify_password_async",
+    "encrypt_password_async",
     "decode_jwt_token",
     "create_jwt_token",
     "get_current_user",
     "require_admin",
     "create_refresh_token",
     "decode_refresh_jwt_token",
+    "token_claims",
+    "identity_cache",
+    "invalidate_identity",
+    "auth_rate_limiter",
+    "enforce_auth_rate_limit",
 ]
@@ -1,11 +1,33 @@
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import select
-from app import AsyncSession, get_session, credential_exception
+from app import (
+    AsyncSession,
+    get_session,
+    credential_exception,
+    get_settings,
+    Settings,
+    TTLCache,
+)
 from auth import decode_jwt_token
 from models import User, Role
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/token")
+settings: Settings = get_settings()
+
+# detached User rows keyed by id, so most requests authenticate without a query
+identity_cache: TTLCache[UUID, User] = TTLCache(
+    maxsize=settings.identity_cache_size, ttl=settings.identity_cache_ttl
+)
+
+
+def invalidate_identity(user_id: UUID) -> None:
+    """
+    drop a cached user after it is deleted or its role changes; this worker
+    only, which is why require_admin checks the role in the database
+    """
+    identity_cache.pop(user_id)
 
 
 async def get_current_user(
@@ -19,15 +41,53 @@ async def get_current_user(
     if not email:
         raise credential_exception()
 
-    user = (await session.exec(select(User).where(User.email == email))).first()
+    raw_user_id: str | None = payload.get("uid")
+    if raw_user_id:
+        try:
+            user_id = UUID(raw_user_id)
+        except ValueError:
+            raise credential_exception()
+
+        cached = identity_cache.get(user_id)
+        if cached:
+            return cached
+
+        user = await session.get(User, user_id)
+    else:
+        # tokens issued before the id was embedded in the claims
+        user = (await session.exec(select(User).where(User.email == email))).first()
+
+    if user:
+        # detach it so the cached instance is never tied to this request's session
+        session.expunge(user)
+    # end the lookup's transaction: the session's pooled connection is not held
+    # through the route (an agent run can take a minute), the next query takes one
+    await session.rollback()
+
     if not user:
         raise credential_exception()
 
+    identity_cache.set(user.id, user)
+
     return user
 
 
-async def require_admin(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role != Role.admin:
+async def require_admin(
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> User:
+    # the identity cache is per worker, so a demotion or deletion made on
+    # another one may not have reached it yet; authorise on the stored role
+    role = (
+        await session.exec(select(User.role).where(User.id == current_user.id))
+    ).first()
+    if role is None:
+        invalidate_identity(current_user.id)
+        raise credential_exception()
+    if role != current_user.role:
+        invalidate_identity(current_user.id)
+
+    if role != Role.admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this route",
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from math import ceil
+from time import monotonic
+from fastapi import Request
+from app import Settings, get_settings, raise_429_exception
+
+settings: Settings = get_settings()
+
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets, one per key, refilled continuously at `rate`
+    tokens per second up to `capacity`. Only the least recently used
+    `max_keys` buckets are kept; an evicted key simply starts full again.
+    """
+
+    def __init__(self, capacity: int, rate: float, max_keys: int):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_keys = max_keys
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted = 0
+        # key -> (tokens, last refill time); a tuple keeps each bucket small
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def _refilled(self, key: str, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return float(self.capacity)
+
+        tokens, updated_at = bucket
+        return min(self.capacity, tokens + (now - updated_at) * self.rate)
+
+    def acquire(self, *keys: str) -> float:
+        """
+        Take one token from every key's bucket. Returns 0 when allowed,
+        otherwise the seconds until all of them have a token again; nothing
+        is consumed on rejection.
+        """
+        now = monotonic()
+        levels = {key: self._refilled(key, now) for key in keys}
+
+        wait = max((1 - tokens) / self.rate for tokens in levels.values())
+        if wait > 0:
+            self.rejected += 1
+            return wait
+
+        for key, tokens in levels.items():
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evicted += 1
+
+        self.allowed += 1
+        return 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+            "tracked_keys": len(self._buckets),
+            "max_keys": self.max_keys,
+            "capacity": self.capacity,
+            "refill_per_second": self.rate,
+        }
+
+
+auth_rate_limiter = TokenBucketLimiter(
+    capacity=settings.auth_rate_limit_burst,
+    rate=settings.auth_rate_limit_per_minute / 60,
+    max_keys=settings.auth_rate_limit_max_keys,
+)
+
+
+def client_ip(request: Request) -> str:
+    if settings.trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+
+    return request.client.host if request.client else "unknown"
+
+
+def enforce_auth_rate_limit(request: Request, username: str) -> None:
+    """reject with 429 before any password hashing happens"""
+    wait = auth_rate_limiter.acquire(
+        f"ip:{client_ip(request)}", f"user:{username.strip().lower()}"
+    )
+    if wait:
+        raise raise_429_exception(retry_after=ceil(wait))
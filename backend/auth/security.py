@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pwdlib import PasswordHash
 from pwdlib.hashers.argon2 import Argon2Hasher
 from datetime import timedelta, datetime
@@ -5,10 +7,17 @@ from typing import Optional, Any
 from jose import jwt
 from jose.exceptions import JWTError
 from app import Settings, get_settings
+from models import User
 
 settings: Settings = get_settings()
 password_hash = PasswordHash((Argon2Hasher(),))
 
+# argon2 releases the GIL while hashing, so a few threads keep it off the event
+# loop; the worker count caps how many CPUs a burst of logins can take
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers, thread_name_prefix="argon2"
+)
+
 
 def encrypt_password(plain_password: str) -> str:
     return password_hash.hash(password=plain_password)
@@ -18,6 +27,26 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return password_hash.verify(password=plain_password, hash=hashed_password)
 
 
+async def encrypt_password_async(plain_password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(
+        password_hash_executor, encrypt_password, plain_password
+    )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        password_hash_executor, verify_password, plain_password, hashed_password
+    )
+
+
+def token_claims(user: User) -> dict[str, str]:
+    """
+    identity claims carried by access and refresh tokens; no role, which
+    would outlive a demotion for as long as the token is valid
+    """
+    return {"sub": user.email, "uid": str(user.id)}
+
+
 def create_jwt_token(data: dict, expires: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now() + (expires or timedelta(minutes=15))
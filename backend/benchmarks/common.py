@@ -0,0 +1,38 @@
+import os
+import statistics
+import tempfile
+
+# every seeded user shares this password (hashed once by the seeder)
+BENCH_PASSWORD = "bench-password"
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///" + os.path.join(
+    tempfile.gettempdir(), "finance_bench.db"
+)
+
+
+def bench_email(index: int) -> str:
+    return f"bench-user-{index}@example.com"
+
+
+def configure_environment(database_url: str, **overrides: str) -> None:
+    """settings are read at import time, so call this before importing the app"""
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("REFRESH_TOKEN_SECRET_KEY", "benchmark-refresh")
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.update(overrides)
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+
+    def pick(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "p50_ms": round(pick(0.50), 2),
+        "p95_ms": round(pick(0.95), 2),
+        "p99_ms": round(pick(0.99), 2),
+        "max_ms": round(ordered[-1], 2),
+        "mean_ms": round(statistics.fmean(ordered), 2),
+    }
@@ -0,0 +1,180 @@
+"""
+Show how month-scoped expense queries change once they filter on half-open
+date ranges backed by the (user_id, date) / (user_id, category_id, date)
+indexes instead of extract(month/year, date).
+
+Seeds a scratch ``bench_expenses`` table (it never touches app tables),
+prints the query plan and median runtime of the old and new filters, before
+and after the indexes exist, then drops the table.
+
+    uv run python -m benchmarks.expense_index_plan --rows 2000000
+    uv run python -m benchmarks.expense_index_plan \\
+        --database-url sqlite+aiosqlite:///bench.db
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    Table,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app import get_settings, month_bounds
+
+metadata = MetaData()
+bench_expenses = Table(
+    "bench_expenses",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, nullable=False),
+    Column("category_id", Integer),
+    Column("amount", Float, nullable=False),
+    Column("date", DateTime, nullable=False),
+)
+indexes = [
+    Index(
+        "ix_bench_expenses_user_id_date",
+        bench_expenses.c.user_id,
+        bench_expenses.c.date,
+    ),
+    Index(
+        "ix_bench_expenses_user_id_category_id_date",
+        bench_expenses.c.user_id,
+        bench_expenses.c.category_id,
+        bench_expenses.c.date,
+    ),
+]
+
+SEED_SQL = {
+    "postgresql": """
+        INSERT INTO bench_expenses (user_id, category_id, amount, date)
+        SELECT g % :users + 1,
+               g % :categories + 1,
+               (g % 50000) / 100.0,
+               timestamp '2026-01-01' - (g % 1095) * interval '1 day'
+        FROM generate_series(1, :rows) AS g
+    """,
+    "sqlite": """
+        INSERT INTO bench_expenses (user_id, category_id, amount, date)
+        WITH RECURSIVE seq(g) AS (
+            SELECT 1 UNION ALL SELECT g + 1 FROM seq WHERE g < :rows
+        )
+        SELECT g % :users + 1,
+               g % :categories + 1,
+               (g % 50000) / 100.0,
+               datetime('2026-01-01', '-' || (g % 1095) || ' days')
+        FROM seq
+    """,
+}
+
+
+def month_queries(user_id: int, category_id: int, year: int, month: int):
+    start, end = month_bounds(year, month)
+    spent = func.sum(bench_expenses.c.amount)
+
+    by_extract = [
+        func.extract("month", bench_expenses.c.date) == month,
+        func.extract("year", bench_expenses.c.date) == year,
+    ]
+    by_range = [bench_expenses.c.date >= start, bench_expenses.c.date < end]
+    user = bench_expenses.c.user_id == user_id
+    category = bench_expenses.c.category_id == category_id
+
+    return {
+        "user month, extract(month/year)": select(spent).where(user, *by_extract),
+        "user month, date range": select(spent).where(user, *by_range),
+        "user category month, extract(month/year)": select(spent).where(
+            user, category, *by_extract
+        ),
+        "user category month, date range": select(spent).where(
+            user, category, *by_range
+        ),
+    }
+
+
+async def explain(connection: AsyncConnection, statement) -> list[str]:
+    dialect = connection.dialect
+    compiled = statement.compile(dialect=dialect)
+    params = tuple(compiled.params[key] for key in compiled.positiontup or [])
+    prefix = "EXPLAIN QUERY PLAN " if dialect.name == "sqlite" else "EXPLAIN "
+
+    result = await connection.exec_driver_sql(prefix + str(compiled), params)
+    return [str(row[-1]) for row in result.all()]
+
+
+async def median_ms(connection: AsyncConnection, statement, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        (await connection.execute(statement)).scalar()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def report(connection: AsyncConnection, label: str, repeat: int) -> None:
+    print(f"\n=== {label} ===")
+    for name, statement in month_queries(42, 3, 2025, 6).items():
+        plan = await explain(connection, statement)
+        elapsed = await median_ms(connection, statement, repeat)
+        print(f"\n-- {name}: median {elapsed:.2f} ms over {repeat} runs")
+        for line in plan:
+            print(f"   {line}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.database_url)
+    dialect = engine.dialect.name
+    if dialect not in SEED_SQL:
+        raise SystemExit(f"unsupported database dialect: {dialect}")
+
+    try:
+        async with engine.begin() as connection:
+            # CreateTable leaves the indexes out so the first pass runs without them
+            await connection.execute(text("DROP TABLE IF EXISTS bench_expenses"))
+            await connection.execute(CreateTable(bench_expenses))
+
+            started = time.perf_counter()
+            await connection.execute(
+                text(SEED_SQL[dialect]),
+                {"rows": args.rows, "users": args.users, "categories": args.categories},
+            )
+            await connection.execute(text("ANALYZE bench_expenses"))
+            print(
+                f"seeded {args.rows:,} rows for {args.users:,} users "
+                f"in {time.perf_counter() - started:.1f}s ({dialect})"
+            )
+
+            await report(connection, "without indexes", args.repeat)
+
+            for index in indexes:
+                await connection.execute(CreateIndex(index))
+            await connection.execute(text("ANALYZE bench_expenses"))
+
+            await report(connection, "with composite indexes", args.repeat)
+    finally:
+        if not args.keep:
+            async with engine.begin() as connection:
+                await connection.execute(text("DROP TABLE IF EXISTS bench_expenses"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=get_settings().database_url)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded table")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,270 @@
+"""
+Drive the app with concurrent clients over data from benchmarks.seed and
+report throughput and p50/p95/p99 latency per endpoint as JSON, so runs on
+two commits can be diffed.
+
+Every client signs in as one of the seeded users and then loops over a
+weighted mix of reads (categories, expense pages, budget summary) and
+expense CRUD. By default the app runs in-process (one event loop, like a
+single worker) and the agent endpoint answers through a stub model with a
+fixed latency; with --base-url the requests go to a running server
+instead and the agent endpoint is left out.
+
+    uv run python -m benchmarks.seed --reset
+    uv run python -m benchmarks.load --clients 50 --duration 30 --output before.json
+    uv run python -m benchmarks.load --base-url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from contextlib import AsyncExitStack
+from benchmarks.common import (
+    BENCH_PASSWORD,
+    DEFAULT_DATABASE_URL,
+    bench_email,
+    configure_environment,
+    percentiles,
+)
+
+# (endpoint label, weight); labels are route templates so results line up
+# with /metrics
+MIX = [
+    ("GET /categories", 15),
+    ("GET /expenses", 20),
+    ("GET /expenses/{id}", 5),
+    ("GET /budget/summary", 20),
+    ("GET /expenses/stats", 5),
+    ("POST /expenses/create", 15),
+    ("PUT /expenses/{id}", 8),
+    ("DELETE /expenses/{id}", 7),
+    ("POST /agent/chat", 5),
+]
+
+AGENT_QUESTIONS = [
+    "Am I over budget?",
+    "What are my top expenses this month?",
+    "Can I afford a $500 phone?",
+]
+
+
+class Recorder:
+    def __init__(self):
+        self.timings: defaultdict[str, list[float]] = defaultdict(list)
+        self.statuses: defaultdict[str, Counter[int]] = defaultdict(Counter)
+
+    async def call(self, label: str, request):
+        started = time.perf_counter()
+        response = await request
+        self.timings[label].append((time.perf_counter() - started) * 1000)
+        self.statuses[label][response.status_code] += 1
+        return response
+
+
+class VirtualClient:
+    def __init__(self, client, recorder: Recorder, email: str, seed: int):
+        self.client = client
+        self.recorder = recorder
+        self.email = email
+        self.rng = random.Random(seed)
+        self.headers: dict[str, str] = {}
+        self.category_ids: list[str] = []
+        self.expense_ids: list[str] = []
+
+    async def sign_in(self, recorder: Recorder) -> None:
+        """sign in and learn a few ids; recorded apart from the timed run"""
+        response = await recorder.call(
+            "POST /users/token",
+            self.client.post(
+                "/users/token",
+                data={"username": self.email, "password": BENCH_PASSWORD},
+            ),
+        )
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        categories = await recorder.call(
+            "GET /categories", self.client.get("/categories", headers=self.headers)
+        )
+        body = categories.json()
+        self.category_ids = [c["id"] for c in body] if isinstance(body, list) else []
+
+        page = await recorder.call(
+            "GET /expenses",
+            self.client.get("/expenses", params={"limit": 50}, headers=self.headers),
+        )
+        self.expense_ids = [e["id"] for e in page.json().get("expenses", [])]
+
+    async def step(self, label: str) -> None:
+        get, headers = self.client.get, self.headers
+
+        if label == "GET /categories":
+            await self.recorder.call(label, get("/categories", headers=headers))
+        elif label == "GET /expenses":
+            params = {"limit": 50, "sort_by": self.rng.choice(["date", "amount"])}
+            await self.recorder.call(
+                label, get("/expenses", params=params, headers=headers)
+            )
+        elif label == "GET /budget/summary":
+            params = {}
+            if self.rng.random() < 0.3:
+                month = self.rng.randrange(1, 13)
+                params["month"] = f"{time.localtime().tm_year - 1}-{month:02d}"
+            await self.recorder.call(
+                label, get("/budget/summary", params=params, headers=headers)
+            )
+        elif label == "GET /expenses/stats":
+            params = {"period": self.rng.choice(["day", "week", "month"])}
+            await self.recorder.call(
+                label, get("/expenses/stats", params=params, headers=headers)
+            )
+        elif label == "POST /expenses/create" and self.category_ids:
+            payload = {
+                "category_id": self.rng.choice(self.category_ids),
+                "amount": round(self.rng.uniform(1, 200), 2),
+                "note": "load test",
+            }
+            response = await self.recorder.call(
+                label,
+                self.client.post("/expenses/create", json=payload, headers=headers),
+            )
+            if response.status_code < 300:
+                self.expense_ids.append(response.json()["id"])
+        elif label == "GET /expenses/{id}" and self.expense_ids:
+            expense_id = self.rng.choice(self.expense_ids)
+            await self.recorder.call(
+                label, get(f"/expenses/{expense_id}", headers=headers)
+            )
+        elif label == "PUT /expenses/{id}" and self.expense_ids:
+            expense_id = self.rng.choice(self.expense_ids)
+            payload = {"amount": round(self.rng.uniform(1, 200), 2)}
+            await self.recorder.call(
+                label,
+                self.client.put(
+                    f"/expenses/{expense_id}", json=payload, headers=headers
+                ),
+            )
+        elif label == "DELETE /expenses/{id}" and self.expense_ids:
+            expense_id = self.expense_ids.pop(self.rng.randrange(len(self.expense_ids)))
+            await self.recorder.call(
+                label, self.client.delete(f"/expenses/{expense_id}", headers=headers)
+            )
+        elif label == "POST /agent/chat":
+            payload = {"message": self.rng.choice(AGENT_QUESTIONS)}
+            await self.recorder.call(
+                label, self.client.post("/agent/chat", json=payload, headers=headers)
+            )
+
+    async def run(self, mix: list[tuple[str, int]], deadline: float) -> None:
+        labels = [label for label, _ in mix]
+        weights = [weight for _, weight in mix]
+        while time.perf_counter() < deadline:
+            await self.step(self.rng.choices(labels, weights)[0])
+
+
+async def main(args: argparse.Namespace) -> dict:
+    in_process = args.base_url is None
+    if in_process:
+        # every client signs in at once; keep the auth rate limiter out of it
+        configure_environment(
+            args.database_url, AUTH_RATE_LIMIT_BURST=str(args.clients * 2 + 10)
+        )
+
+    import httpx
+
+    # the stub model can only be swapped in when the app runs in-process
+    include_agent = in_process and not args.no_agent
+    mix = [
+        (label, weight)
+        for label, weight in MIX
+        if include_agent or "/agent" not in label
+    ]
+
+    recorder = Recorder()
+    async with AsyncExitStack() as stack:
+        if in_process:
+            from app.main import app
+            from ai_agent import load_agent_runtime
+            from benchmarks.stub_model import StubModel
+
+            runtime = await load_agent_runtime()
+            runtime.finance_agent.model = StubModel(latency=args.agent_latency)
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://bench"
+            )
+        else:
+            client = httpx.AsyncClient(
+                base_url=args.base_url,
+                timeout=60,
+                limits=httpx.Limits(max_connections=args.clients),
+            )
+        await stack.enter_async_context(client)
+
+        clients = [
+            VirtualClient(
+                client,
+                recorder,
+                bench_email(index % args.users),
+                args.random_seed + index,
+            )
+            for index in range(args.clients)
+        ]
+        setup = Recorder()
+        await asyncio.gather(*(c.sign_in(setup) for c in clients))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(c.run(mix, started + args.duration) for c in clients))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for label, samples in sorted(recorder.timings.items()):
+        statuses = recorder.statuses[label]
+        endpoints[label] = {
+            **percentiles(samples),
+            "rps": round(len(samples) / elapsed, 1),
+            "errors": sum(n for status, n in statuses.items() if status >= 400),
+            "status_codes": {str(status): n for status, n in sorted(statuses.items())},
+        }
+
+    total = sum(len(samples) for samples in recorder.timings.values())
+    return {
+        "target": args.base_url or "in-process",
+        "clients": args.clients,
+        "users": args.users,
+        "duration_seconds": round(elapsed, 2),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 1),
+        "agent_latency_seconds": args.agent_latency if in_process else None,
+        "sign_in": percentiles(setup.timings["POST /users/token"]),
+        "endpoints": endpoints,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument(
+        "--base-url", default=None, help="benchmark a running server instead"
+    )
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument(
+        "--users", type=int, default=50, help="seeded users to sign in as"
+    )
+    parser.add_argument("--duration", type=float, default=20, help="seconds")
+    parser.add_argument(
+        "--agent-latency", type=float, default=0.3, help="stub model seconds per call"
+    )
+    parser.add_argument("--no-agent", action="store_true")
+    parser.add_argument("--random-seed", type=int, default=7)
+    parser.add_argument("--output", default=None, help="also write the JSON here")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(main(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    print(report)
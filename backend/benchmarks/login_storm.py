@@ -0,0 +1,109 @@
+"""
+Measure how a burst of logins affects unrelated requests on one worker.
+
+Drives the real app in-process (same event loop, like a single uvicorn
+worker) and records the latency of GET /health probes while `--logins`
+concurrent POST /users/token requests run. `--mode inline` swaps in the old
+behaviour of verifying the argon2 hash on the event loop for comparison.
+Results are printed as JSON.
+
+    uv run python -m benchmarks.login_storm --mode offloaded
+    uv run python -m benchmarks.login_storm --mode inline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from benchmarks.common import configure_environment, percentiles
+
+
+async def probe(client, stop: asyncio.Event, interval: float) -> list[float]:
+    timings = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        timings.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return timings
+
+
+async def main(args: argparse.Namespace) -> dict:
+    # the storm is deliberate here, keep the auth rate limiter out of the way
+    configure_environment(
+        args.database_url, AUTH_RATE_LIMIT_BURST=str(args.logins + 10)
+    )
+
+    import httpx
+    from sqlmodel import SQLModel
+    from app import build_engine
+    from app.main import app
+    import routes.user
+    from auth import verify_password
+
+    # the app no longer creates tables at startup (see manage.py create-schema)
+    engine = build_engine()
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    await engine.dispose()
+
+    if args.mode == "inline":
+
+        async def verify_inline(plain_password: str, hashed_password: str) -> bool:
+            return verify_password(plain_password, hashed_password)
+
+        routes.user.verify_password_async = verify_inline
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            credentials = {"email": "storm@example.com", "password": "storm-password"}
+            await client.post("/users/create", json=credentials)
+            form = {
+                "username": credentials["email"],
+                "password": credentials["password"],
+            }
+
+            stop = asyncio.Event()
+            idle_probe = asyncio.create_task(probe(client, stop, args.probe_interval))
+            await asyncio.sleep(args.idle_seconds)
+            stop.set()
+            idle = await idle_probe
+
+            stop = asyncio.Event()
+            storm_probe = asyncio.create_task(probe(client, stop, args.probe_interval))
+            started = time.perf_counter()
+            responses = await asyncio.gather(
+                *(client.post("/users/token", data=form) for _ in range(args.logins))
+            )
+            storm_seconds = time.perf_counter() - started
+            stop.set()
+            during_storm = await storm_probe
+
+    return {
+        "mode": args.mode,
+        "logins": args.logins,
+        "login_failures": sum(r.status_code != 200 for r in responses),
+        "storm_seconds": round(storm_seconds, 2),
+        "logins_per_second": round(args.logins / storm_seconds, 1),
+        "health_idle": percentiles(idle),
+        "health_during_storm": percentiles(during_storm),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["offloaded", "inline"], default="offloaded")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--probe-interval", type=float, default=0.005)
+    parser.add_argument("--idle-seconds", type=float, default=1.0)
+    parser.add_argument(
+        "--database-url",
+        default="sqlite+aiosqlite:///"
+        + os.path.join(tempfile.gettempdir(), "login_storm.db"),
+    )
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
@@ -0,0 +1,177 @@
+"""
+Fill a local database with synthetic users, categories, budgets and
+expenses for the load benchmark. The data is reproducible: the same
+`--random-seed` and sizes give the same rows. Users are
+bench-user-<n>@example.com, all with the password in benchmarks.common.
+The monthly rollup is rebuilt at the end. Prints a JSON summary.
+
+    uv run python -m benchmarks.seed --reset --users 100 --expenses 2000000
+    uv run python -m benchmarks.seed --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from uuid import UUID
+from benchmarks.common import (
+    BENCH_PASSWORD,
+    DEFAULT_DATABASE_URL,
+    bench_email,
+    configure_environment,
+)
+
+CATEGORY_NAMES = [
+    "Food",
+    "Rent",
+    "Transport",
+    "Health",
+    "Leisure",
+    "Bills",
+    "Shopping",
+    "Travel",
+    "Education",
+    "Gifts",
+    "Pets",
+    "Savings",
+]
+
+INSERT_CHUNK_SIZE = 10_000
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+async def main(args: argparse.Namespace) -> dict:
+    configure_environment(args.database_url)
+
+    from sqlalchemy import insert, select
+    from sqlmodel import SQLModel
+    from app import build_engine, build_sessionmaker
+    from auth import encrypt_password
+    from models import User, Role, Category, Budget, Expenses, normalize_category_name
+    from services import rebuild_rollup
+
+    rng = random.Random(args.random_seed)
+    now = datetime.now().replace(microsecond=0)
+    span_seconds = int(timedelta(days=30 * args.months).total_seconds())
+    categories_per_user = min(args.categories, len(CATEGORY_NAMES))
+    started = time.perf_counter()
+
+    engine = build_engine()
+    async with engine.begin() as connection:
+        if args.reset:
+            await connection.run_sync(SQLModel.metadata.drop_all)
+        await connection.run_sync(SQLModel.metadata.create_all)
+
+        existing = (
+            await connection.execute(
+                select(User.id).where(User.email == bench_email(0)).limit(1)
+            )
+        ).first()
+        if existing:
+            await engine.dispose()
+            sys.exit("benchmark users already exist, pass --reset to start over")
+
+        # one argon2 hash shared by every user keeps seeding fast
+        hashed_password = encrypt_password(BENCH_PASSWORD)
+        users, categories, budgets = [], [], []
+        for index in range(args.users):
+            user_id = _uuid(rng)
+            users.append(
+                {
+                    "id": user_id,
+                    "name": f"Bench {index}",
+                    "email": bench_email(index),
+                    "hashed_password": hashed_password,
+                    "role": Role.user,
+                    "created_at": now,
+                    "data_version": 0,
+                }
+            )
+            for name in CATEGORY_NAMES[:categories_per_user]:
+                category_id = _uuid(rng)
+                categories.append(
+                    {
+                        "id": category_id,
+                        "user_id": user_id,
+                        "name": name,
+                        "normalized_name": normalize_category_name(name),
+                        "created_at": now,
+                    }
+                )
+                if rng.random() < args.budget_ratio:
+                    budgets.append(
+                        {
+                            "id": _uuid(rng),
+                            "user_id": user_id,
+                            "category_id": category_id,
+                            "monthly_limit_cents": rng.randrange(100, 2_000, 50) * 100,
+                            "created_at": now,
+                        }
+                    )
+
+        await connection.execute(insert(User), users)
+        await connection.execute(insert(Category), categories)
+        if budgets:
+            await connection.execute(insert(Budget), budgets)
+
+    # expenses are spread evenly over the users, each landing in one of the
+    # user's categories at a random time over the last `--months` months
+    written = 0
+    while written < args.expenses:
+        size = min(INSERT_CHUNK_SIZE, args.expenses - written)
+        chunk = []
+        for _ in range(size):
+            user_index = rng.randrange(args.users)
+            category = categories[
+                user_index * categories_per_user + rng.randrange(categories_per_user)
+            ]
+            chunk.append(
+                {
+                    "id": _uuid(rng),
+                    "user_id": category["user_id"],
+                    "category_id": category["id"],
+                    "amount_cents": round((rng.expovariate(1 / 40) + 1) * 100),
+                    "date": now - timedelta(seconds=rng.randrange(span_seconds)),
+                    "note": None,
+                }
+            )
+        async with engine.begin() as connection:
+            await connection.execute(insert(Expenses), chunk)
+        written += size
+
+    async with build_sessionmaker(engine)() as session:
+        rollup_rows = await rebuild_rollup(session)
+    await engine.dispose()
+
+    return {
+        "database_url": engine.url.render_as_string(hide_password=True),
+        "users": len(users),
+        "categories": len(categories),
+        "budgets": len(budgets),
+        "expenses": written,
+        "rollup_rows": rollup_rows,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument(
+        "--reset", action="store_true", help="drop and recreate every table first"
+    )
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--categories", type=int, default=8, help="per user")
+    parser.add_argument(
+        "--budget-ratio", type=float, default=0.6, help="share of categories"
+    )
+    parser.add_argument("--expenses", type=int, default=200_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--random-seed", type=int, default=42)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
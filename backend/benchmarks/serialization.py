@@ -0,0 +1,137 @@
+"""
+Compare the old and new read path for a large expense list (10k rows by
+default), end to end through FastAPI and for the serialisation step alone.
+
+before: load ORM instances with select(Expenses) and return them without a
+response model, so FastAPI runs them through jsonable_encoder + json.dumps
+(how the list endpoints used to work).
+after: select the ExpenseRead columns as plain rows and return them under
+response_model=ExpensePage, so pydantic-core validates them and writes the
+JSON bytes itself (how GET /expenses works now).
+
+Runs on its own scratch SQLite file; results are printed as JSON.
+
+    uv run python -m benchmarks.serialization --rows 10000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+from benchmarks.common import configure_environment, percentiles
+
+
+async def main(args: argparse.Namespace) -> dict:
+    database_path = os.path.join(tempfile.gettempdir(), "finance_serialization.db")
+    if os.path.exists(database_path):
+        os.remove(database_path)
+    configure_environment("sqlite+aiosqlite:///" + database_path)
+
+    import httpx
+    from fastapi import FastAPI
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from sqlalchemy import insert
+    from sqlmodel import SQLModel, select
+    from app import build_engine, build_sessionmaker
+    from models import Expenses, ExpensePage
+    from routes.expense import EXPENSE_READ_COLUMNS
+
+    engine = build_engine()
+    sessions = build_sessionmaker(engine)
+    user_id = uuid4()
+    rng = random.Random(args.random_seed)
+    now = datetime.now()
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.execute(
+            insert(Expenses),
+            [
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "category_id": None,
+                    "amount_cents": rng.randrange(100, 50_000),
+                    "date": now - timedelta(minutes=index),
+                    "note": "benchmark row" if index % 3 else None,
+                }
+                for index in range(args.rows)
+            ],
+        )
+
+    def orm_statement():
+        return select(Expenses).where(Expenses.user_id == user_id)
+
+    def row_statement():
+        return select(*EXPENSE_READ_COLUMNS).where(Expenses.user_id == user_id)
+
+    bench = FastAPI()
+
+    @bench.get("/before")
+    async def before():
+        async with sessions() as session:
+            expenses = (await session.exec(orm_statement())).all()
+        return {"expenses": expenses, "next_cursor": None}
+
+    @bench.get("/after", response_model=ExpensePage)
+    async def after():
+        async with sessions() as session:
+            expenses = (await session.exec(row_statement())).all()
+        return {"expenses": expenses, "next_cursor": None}
+
+    report: dict = {"rows": args.rows, "repeat": args.repeat, "end_to_end": {}}
+    transport = httpx.ASGITransport(app=bench)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for path in ("/before", "/after"):
+            await c.get(path)  # warm up
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = await c.get(path)
+                timings.append((time.perf_counter() - started) * 1000)
+            report["end_to_end"][path.strip("/")] = {
+                **percentiles(timings),
+                "bytes": len(response.content),
+            }
+
+    # serialisation only, on rows already in memory
+    async with sessions() as session:
+        orm_rows = (await session.exec(orm_statement())).all()
+        plain_rows = (await session.exec(row_statement())).all()
+    page = TypeAdapter(ExpensePage)
+
+    def serialise_before() -> bytes:
+        content = jsonable_encoder({"expenses": orm_rows, "next_cursor": None})
+        return json.dumps(content, separators=(",", ":")).encode()
+
+    def serialise_after() -> bytes:
+        value = page.validate_python(
+            {"expenses": plain_rows, "next_cursor": None}, from_attributes=True
+        )
+        return page.dump_json(value, by_alias=True)
+
+    report["serialize_only"] = {}
+    for name, serialise in (("before", serialise_before), ("after", serialise_after)):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            serialise()
+            timings.append((time.perf_counter() - started) * 1000)
+        report["serialize_only"][name] = percentiles(timings)
+
+    await engine.dispose()
+    os.remove(database_path)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--random-seed", type=int, default=7)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
@@ -0,0 +1,146 @@
+"""
+Measure worker cold start: importing app.main, running the lifespan, the
+first request, and loading the agent runtime on first use.
+
+Each sample runs in a fresh interpreter so nothing is already imported.
+Timings are reported as JSON (median / min / max over `--runs`), together
+with the packages that take longest to import. `--with-create-all` also
+times `SQLModel.metadata.create_all`, which used to run on every boot, for
+comparison against the remote database.
+
+    uv run python -m benchmarks.startup --runs 5
+    uv run python -m benchmarks.startup --database-url postgresql+asyncpg://... --with-create-all
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from benchmarks.common import DEFAULT_DATABASE_URL, configure_environment
+
+CHILD_FLAG = "--child"
+
+
+async def measure(args: argparse.Namespace) -> dict:
+    """one cold start; runs in the child interpreter"""
+    configure_environment(args.database_url)
+    timings = {}
+
+    started = time.perf_counter()
+    from app.main import app
+
+    timings["import_app_seconds"] = time.perf_counter() - started
+    agent_loaded_at_boot = "agents" in sys.modules
+
+    import httpx
+    from ai_agent import load_agent_runtime
+
+    lifespan = app.router.lifespan_context(app)
+    started = time.perf_counter()
+    await lifespan.__aenter__()
+    timings["lifespan_startup_seconds"] = time.perf_counter() - started
+
+    # first request opens the first pooled connection
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        started = time.perf_counter()
+        await c.get("/health")
+        timings["first_health_seconds"] = time.perf_counter() - started
+
+    if args.with_create_all:
+        from sqlmodel import SQLModel
+
+        started = time.perf_counter()
+        async with app.state.engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+        timings["create_all_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await load_agent_runtime()
+    timings["agent_runtime_load_seconds"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await lifespan.__aexit__(None, None, None)
+    timings["lifespan_shutdown_seconds"] = time.perf_counter() - started
+
+    return {
+        "timings": timings,
+        "agent_loaded_at_boot": agent_loaded_at_boot,
+    }
+
+
+def run_child(args: argparse.Namespace, importtime: bool = False) -> tuple[dict, str]:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += [
+        "-m",
+        "benchmarks.startup",
+        CHILD_FLAG,
+        "--database-url",
+        args.database_url,
+    ]
+    if args.with_create_all:
+        command.append("--with-create-all")
+
+    completed = subprocess.run(
+        command, capture_output=True, text=True, check=True, cwd=os.getcwd()
+    )
+    # the app prints lifespan messages, the result is the last line
+    return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+
+def slowest_imports(importtime_log: str, top: int) -> dict[str, float]:
+    """self time per top-level package from `python -X importtime` output"""
+    per_package: Counter[str] = Counter()
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        per_package[module.strip().split(".")[0]] += int(self_us)
+    return {
+        package: round(micros / 1_000_000, 3)
+        for package, micros in per_package.most_common(top)
+    }
+
+
+def main(args: argparse.Namespace) -> dict:
+    samples = [run_child(args)[0] for _ in range(args.runs)]
+    _, importtime_log = run_child(args, importtime=True)
+
+    summary = {}
+    for name in samples[0]["timings"]:
+        values = [sample["timings"][name] for sample in samples]
+        summary[name] = {
+            "median": round(statistics.median(values), 3),
+            "min": round(min(values), 3),
+            "max": round(max(values), 3),
+        }
+
+    return {
+        "database_url": args.database_url,
+        "runs": args.runs,
+        "agent_loaded_at_boot": samples[0]["agent_loaded_at_boot"],
+        "seconds": summary,
+        "slowest_imports_seconds": slowest_imports(importtime_log, args.top_imports),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top-imports", type=int, default=10)
+    parser.add_argument("--with-create-all", action="store_true")
+    parser.add_argument(CHILD_FLAG, action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(measure(args))))
+    else:
+        print(json.dumps(main(args), indent=2))
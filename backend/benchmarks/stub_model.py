@@ -0,0 +1,116 @@
+"""
+A stand-in for the Gemini chat model so agent endpoints can be load tested
+without network calls or api costs. It behaves like a model that always
+calls one tool and then answers with (the start of) the tool's output,
+sleeping `latency` seconds per model call.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from agents import ModelResponse, Usage
+from agents.models.interface import Model
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+
+# question keyword -> tool the stub calls for it
+TOOL_FOR_KEYWORD = {
+    "budget": "get_budget_status",
+    "top": "get_top_expenses",
+    "afford": "can_afford_suggestion",
+}
+TOOL_ARGUMENTS = {
+    "can_afford_suggestion": '{"item_name": "phone", "item_price": 500}',
+}
+
+
+class StubModel(Model):
+    def __init__(self, latency: float = 0.3):
+        self.latency = latency
+        self.calls = 0
+
+    def _next_output(self, input) -> list:
+        items = input if isinstance(input, list) else []
+        tool_outputs = [
+            item
+            for item in items
+            if isinstance(item, dict) and item.get("type") == "function_call_output"
+        ]
+        if tool_outputs:
+            text = str(tool_outputs[-1].get("output", ""))[:200]
+            return [
+                ResponseOutputMessage(
+                    id="stub-message",
+                    role="assistant",
+                    status="completed",
+                    type="message",
+                    content=[
+                        ResponseOutputText(
+                            type="output_text", text=text, annotations=[]
+                        )
+                    ],
+                )
+            ]
+
+        question = input if isinstance(input, str) else str(items[0])
+        tool = next(
+            (
+                name
+                for keyword, name in TOOL_FOR_KEYWORD.items()
+                if keyword in question.lower()
+            ),
+            "get_budget_status",
+        )
+        return [
+            ResponseFunctionToolCall(
+                type="function_call",
+                call_id=f"stub-call-{self.calls}",
+                name=tool,
+                arguments=TOOL_ARGUMENTS.get(tool, "{}"),
+            )
+        ]
+
+    async def get_response(self, system_instructions, input, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return ModelResponse(
+            output=self._next_output(input), usage=Usage(), response_id=None
+        )
+
+    async def stream_response(
+        self, system_instructions, input, *args, **kwargs
+    ) -> AsyncIterator:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        output = self._next_output(input)
+        for item in output:
+            if isinstance(item, ResponseOutputMessage):
+                yield ResponseTextDeltaEvent(
+                    type="response.output_text.delta",
+                    delta=item.content[0].text,
+                    item_id=item.id,
+                    output_index=0,
+                    content_index=0,
+                    sequence_number=0,
+                    logprobs=[],
+                )
+        yield ResponseCompletedEvent(
+            type="response.completed",
+            sequence_number=1,
+            response=Response(
+                id="stub-response",
+                created_at=time.time(),
+                model="stub",
+                object="response",
+                output=output,
+                parallel_tool_calls=False,
+                tool_choice="auto",
+                tools=[],
+            ),
+        )
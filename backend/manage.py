@@ -0,0 +1,242 @@
+"""
+Operational commands that run outside the API process.
+
+    uv run python manage.py create-schema
+    uv run python manage.py money-to-cents
+    uv run python manage.py category-names-backfill
+    uv run python manage.py rollup-rebuild [--user-id UUID]
+    uv run python manage.py rollup-verify [--user-id UUID]
+"""
+
+import argparse
+import asyncio
+import sys
+from uuid import UUID
+from sqlalchemy import inspect, text
+from sqlmodel import SQLModel
+from app import build_engine, build_sessionmaker
+from models import Category, from_cents, normalize_category_name
+from services import rebuild_rollup, verify_rollup
+
+
+async def create_schema(args: argparse.Namespace) -> int:
+    engine = build_engine()
+    async with engine.begin() as connection:
+        existing = await connection.run_sync(
+            lambda sync_connection: set(inspect(sync_connection).get_table_names())
+        )
+        await connection.run_sync(SQLModel.metadata.create_all)
+    await engine.dispose()
+
+    created = [
+        table.name
+        for table in SQLModel.metadata.sorted_tables
+        if table.name not in existing
+    ]
+    if created:
+        print(f"Created table(s): {', '.join(created)}")
+    else:
+        print("All tables already exist")
+    return 0
+
+
+# (table, old float column, integer cents column)
+MONEY_COLUMNS = [
+    ("expenses", "amount", "amount_cents"),
+    ("budget", "monthly_limit", "monthly_limit_cents"),
+    ("monthlyspend", "total", "total_cents"),
+]
+
+
+async def money_to_cents(args: argparse.Namespace) -> int:
+    engine = build_engine()
+    async with engine.begin() as connection:
+        postgres = connection.dialect.name == "postgresql"
+        for table, old_column, cents_column in MONEY_COLUMNS:
+            columns = await connection.run_sync(
+                lambda sync_connection: {
+                    column["name"]
+                    for column in inspect(sync_connection).get_columns(table)
+                }
+            )
+            if old_column not in columns:
+                print(f"{table}: already stores {cents_column}")
+                continue
+
+            if cents_column not in columns:
+                await connection.execute(
+                    text(
+                        f"ALTER TABLE {table} "
+                        f"ADD COLUMN {cents_column} BIGINT NOT NULL DEFAULT 0"
+                    )
+                )
+            # on Postgres round the decimal value rather than the binary float
+            amount = f"CAST({old_column} AS NUMERIC)" if postgres else old_column
+            converted = await connection.execute(
+                text(f"UPDATE {table} SET {cents_column} = ROUND({amount} * 100)")
+            )
+            if postgres and table != "monthlyspend":
+                await connection.execute(
+                    text(
+                        f"ALTER TABLE {table} ALTER COLUMN {cents_column} DROP DEFAULT"
+                    )
+                )
+            await connection.execute(
+                text(f"ALTER TABLE {table} DROP COLUMN {old_column}")
+            )
+            print(
+                f"{table}: {converted.rowcount} row(s) converted "
+                f"from {old_column} to {cents_column}"
+            )
+    await engine.dispose()
+
+    print("Run `python manage.py rollup-verify` to check the converted totals")
+    return 0
+
+
+CATEGORY_BACKFILL_CHUNK = 1000
+
+
+async def category_names_backfill(args: argparse.Namespace) -> int:
+    engine = build_engine()
+    try:
+        async with engine.begin() as connection:
+            postgres = connection.dialect.name == "postgresql"
+            columns = await connection.run_sync(
+                lambda sync_connection: {
+                    column["name"]
+                    for column in inspect(sync_connection).get_columns("category")
+                }
+            )
+            if "normalized_name" not in columns:
+                # nullable until every row is filled in
+                await connection.execute(
+                    text("ALTER TABLE category ADD COLUMN normalized_name VARCHAR(40)")
+                )
+
+            rows = (
+                await connection.execute(
+                    text("SELECT id, user_id, name, normalized_name FROM category")
+                )
+            ).all()
+            seen: dict[tuple, str] = {}
+            duplicates = []
+            for _, user_id, name, _ in rows:
+                key = (user_id, normalize_category_name(name))
+                if key in seen:
+                    duplicates.append((user_id, seen[key], name))
+                else:
+                    seen[key] = name
+            if duplicates:
+                print(f"{len(duplicates)} category name(s) clash once normalised:")
+                for user_id, first, second in duplicates:
+                    print(f"  user={user_id} {first!r} / {second!r}")
+                print("Rename or merge them, then run this command again")
+                return 1
+
+            changed = [
+                {"id": category_id, "normalized_name": normalize_category_name(name)}
+                for category_id, _, name, normalized_name in rows
+                if normalized_name != normalize_category_name(name)
+            ]
+            for start in range(0, len(changed), CATEGORY_BACKFILL_CHUNK):
+                await connection.execute(
+                    text(
+                        "UPDATE category SET normalized_name = :normalized_name "
+                        "WHERE id = :id"
+                    ),
+                    changed[start : start + CATEGORY_BACKFILL_CHUNK],
+                )
+
+            if postgres:
+                await connection.execute(
+                    text(
+                        "ALTER TABLE category ALTER COLUMN normalized_name SET NOT NULL"
+                    )
+                )
+            for index in Category.__table__.indexes:
+                await connection.run_sync(index.create, checkfirst=True)
+    finally:
+        await engine.dispose()
+
+    print(f"Backfilled normalized_name for {len(changed)} category row(s)")
+    return 0
+
+
+async def rollup_rebuild(args: argparse.Namespace) -> int:
+    engine = build_engine()
+    async with build_sessionmaker(engine)() as session:
+        written = await rebuild_rollup(session, user_id=args.user_id)
+    await engine.dispose()
+
+    print(f"Rebuilt monthly rollup: {written} row(s) written")
+    return 0
+
+
+async def rollup_verify(args: argparse.Namespace) -> int:
+    engine = build_engine()
+    async with build_sessionmaker(engine)() as session:
+        drift = await verify_rollup(session, user_id=args.user_id)
+    await engine.dispose()
+
+    if not drift:
+        print("Monthly rollup matches the expense rows")
+        return 0
+
+    print(f"Monthly rollup drift in {len(drift)} bucket(s):")
+    for row in drift:
+        print(
+            f"  user={row['user_id']} category={row['category_id']} "
+            f"month={row['month']:%Y-%m} "
+            f"total {from_cents(row['stored_total_cents'])} "
+            f"!= {from_cents(row['expected_total_cents'])}, "
+            f"count {row['stored_count']} != {row['expected_count']}"
+        )
+    print("Run `python manage.py rollup-rebuild` to recompute it")
+    return 1
+
+
+COMMANDS = {
+    "create-schema": create_schema,
+    "money-to-cents": money_to_cents,
+    "category-names-backfill": category_names_backfill,
+    "rollup-rebuild": rollup_rebuild,
+    "rollup-verify": rollup_verify,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="finance tracker maintenance")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    subcommands.add_parser(
+        "create-schema",
+        help="create missing tables and their indexes (existing ones are left as is)",
+    )
+
+    subcommands.add_parser(
+        "money-to-cents",
+        help="convert float amount columns to integer cents, in one transaction",
+    )
+
+    subcommands.add_parser(
+        "category-names-backfill",
+        help="fill in normalised category names and add the unique index",
+    )
+
+    rebuild = subcommands.add_parser(
+        "rollup-rebuild", help="recompute the monthly rollup from raw expenses"
+    )
+    rebuild.add_argument("--user-id", type=UUID, default=None)
+
+    verify = subcommands.add_parser(
+        "rollup-verify", help="report drift between the rollup and raw expenses"
+    )
+    verify.add_argument("--user-id", type=UUID, default=None)
+
+    args = parser.parse_args()
+    return asyncio.run(COMMANDS[args.command](args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
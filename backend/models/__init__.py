@@ -1,17 +1,64 @@
 from models.user_model import User, UserCreate, Role
-from models.category_model import Category, CategoryCreate
-from models.expense_model import ExpenseCreate, Expenses, ExpenseUpdate
-from models.budget_model import Budget, BudgetCreate, BudgetUpdate
+from models.category_model import (
+    Category,
+    CategoryCreate,
+    CategoryRead,
+    normalize_category_name,
+)
+from models.expense_model import (
+    ExpenseCreate,
+    Expenses,
+    ExpenseRead,
+    ExpensePage,
+    ExpenseUpdate,
+    ExpenseImportRow,
+    ExpenseFilter,
+    ExpenseSelection,
+    ExpenseBatchUpdate,
+)
+from models.budget_model import (
+    Budget,
+    BudgetCreate,
+    BudgetUpdate,
+    BudgetRead,
+    CategoryForecast,
+    BudgetForecast,
+)
+from models.rollup_model import MonthlySpend
+from models.stats_model import StatsPeriod, SpendingSeries, ExpenseStats
+from models.money import Money, Cents, MAX_AMOUNT, to_cents, from_cents
+from models.responses import Message
 
 __all__ = [
     "User",
     "UserCreate",
     "Category",
     "CategoryCreate",
+    "CategoryRead",
+    "normalize_category_name",
     "Expenses",
+    "ExpenseRead",
+    "ExpensePage",
     "ExpenseCreate",
     "ExpenseUpdate",
+    "ExpenseImportRow",
+    "ExpenseFilter",
+    "ExpenseSelection",
+    "ExpenseBatchUpdate",
     "Budget",
     "BudgetCreate",
     "BudgetUpdate",
+    "BudgetRead",
+    "CategoryForecast",
+    "BudgetForecast",
+    "MonthlySpend",
+    "StatsPeriod",
+    "SpendingSeries",
+    "ExpenseStats",
+    "Money",
+    "Cents",
+    "MAX_AMOUNT",
+    "to_cents",
+    "from_cents",
+    "Message",
 ]
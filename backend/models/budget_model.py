@@ -1,8 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger
 from sqlmodel import SQLModel, Relationship, Field
 from typing import Optional, TYPE_CHECKING
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID, uuid4
+from models.money import Money, Cents
 
 if TYPE_CHECKING:
     from models.category_model import Category
@@ -15,16 +17,52 @@ class Budget(SQLModel, table=True):
     category_id: UUID = Field(
         foreign_key="category.id", ondelete="CASCADE", unique=True
     )
-    monthly_limit: float
+    # integer cents, see models.money
+    monthly_limit_cents: int = Field(sa_type=BigInteger)
     created_at: datetime = Field(default_factory=datetime.now)
     category: Optional["Category"] = Relationship(back_populates="budget")
     owner: Optional["User"] = Relationship(back_populates="budgets")
 
 
 class BudgetCreate(SQLModel):
-    monthly_limit: float
+    monthly_limit: Money
     category_id: str
 
 
 class BudgetUpdate(BaseModel):
-    monthly_limit: float
+    monthly_limit: Money
+
+
+class BudgetRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    user_id: UUID
+    category_id: UUID
+    monthly_limit_cents: Cents = Field(serialization_alias="monthly_limit")
+    created_at: datetime
+
+
+class CategoryForecast(BaseModel):
+    category_id: UUID
+    category: str
+    # null when the category has no budget
+    monthly_limit_cents: Optional[Cents] = Field(serialization_alias="monthly_limit")
+    spent_cents: Cents = Field(serialization_alias="spent")
+    # average of the past months, counted from the category's first spending
+    history_average_cents: Cents = Field(serialization_alias="history_average")
+    forecast_cents: Cents = Field(serialization_alias="forecast")
+    forecast_remaining_cents: Optional[Cents] = Field(
+        serialization_alias="forecast_remaining"
+    )
+    will_exceed: bool
+
+
+class BudgetForecast(BaseModel):
+    month: date
+    days_elapsed: int
+    days_in_month: int
+    history_months: int
+    total_spent_cents: Cents = Field(serialization_alias="total_spent")
+    total_forecast_cents: Cents = Field(serialization_alias="total_forecast")
+    categories: list[CategoryForecast]
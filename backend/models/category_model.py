@@ -1,4 +1,5 @@
-from sqlmodel import SQLModel, Field, Relationship
+from pydantic import BaseModel, ConfigDict
+from sqlmodel import SQLModel, Field, Relationship, Index
 from datetime import datetime
 from uuid import UUID, uuid4
 from typing import TYPE_CHECKING, Optional
@@ -9,12 +10,31 @@ if TYPE_CHECKING:
     from models.budget_model import Budget
 
 
+def normalize_category_name(name: str) -> str:
+    """the form names are compared in: case-folded, whitespace collapsed"""
+    return " ".join(name.split()).casefold()
+
+
 class Category(SQLModel, table=True):
+    # names are unique per user regardless of case / spacing, and looked up
+    # by their normalised form
+    __table_args__ = (
+        Index(
+            "ux_category_user_id_normalized_name",
+            "user_id",
+            "normalized_name",
+            unique=True,
+        ),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True, unique=True)
     user_id: Optional[UUID] = Field(
         default=None, foreign_key="user.id", ondelete="CASCADE"
     )
     name: str = Field(min_length=3, max_length=10)
+    # normalize_category_name(name), set by whoever creates the row; wider
+    # than name because case folding can lengthen it ("ß" -> "ss")
+    normalized_name: str = Field(max_length=40)
     expenses: list["Expenses"] = Relationship(back_populates="category")
     created_at: datetime = Field(default_factory=datetime.now)
     owner: Optional["User"] = Relationship(back_populates="categories")
@@ -23,3 +43,12 @@ class Category(SQLModel, table=True):
 
 class CategoryCreate(SQLModel):
     name: str
+
+
+class CategoryRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    user_id: Optional[UUID] = None
+    name: str
+    created_at: datetime
@@ -1,8 +1,10 @@
-from pydantic import BaseModel
-from sqlmodel import SQLModel, Field, Relationship
+from pydantic import BaseModel, ConfigDict, field_validator
+from sqlalchemy import BigInteger
+from sqlmodel import SQLModel, Field, Relationship, Index
 from typing import Optional, TYPE_CHECKING
-from datetime import datetime
+from datetime import date, datetime, timezone
 from uuid import UUID, uuid4
+from models.money import Money, Cents
 
 if TYPE_CHECKING:
     from models.category_model import Category
@@ -10,25 +12,92 @@ if TYPE_CHECKING:
 
 
 class Expenses(SQLModel, table=True):
+    # every read is scoped to one user and usually to a date range,
+    # optionally narrowed to a single category
+    __table_args__ = (
+        Index("ix_expenses_user_id_date", "user_id", "date"),
+        Index("ix_expenses_user_id_category_id_date", "user_id", "category_id", "date"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True, unique=True)
     user_id: UUID = Field(default=None, foreign_key="user.id", ondelete="CASCADE")
     category_id: Optional[UUID] = Field(
         default=None, foreign_key="category.id", ondelete="SET NULL"
     )
-    amount: float
+    # integer cents, see models.money; the API speaks decimal amounts
+    amount_cents: int = Field(sa_type=BigInteger)
     date: datetime = Field(default_factory=datetime.now)
     category: Optional["Category"] = Relationship(back_populates="expenses")
     note: Optional[str] = Field(default=None, max_length=250)
     owner: Optional["User"] = Relationship(back_populates="expenses")
 
 
+class ExpenseRead(BaseModel):
+    """
+    An expense as the API returns it. Validates from attributes, so routes
+    can hand over plain column rows (or an Expenses instance) as they are.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    user_id: UUID
+    category_id: Optional[UUID] = None
+    amount_cents: Cents = Field(serialization_alias="amount")
+    date: datetime
+    note: Optional[str] = None
+
+
+class ExpensePage(BaseModel):
+    expenses: list[ExpenseRead]
+    next_cursor: Optional[str] = None
+
+
 class ExpenseCreate(SQLModel):
     category_id: UUID
-    amount: float
+    amount: Money
     note: Optional[str] = None
 
 
 class ExpenseUpdate(BaseModel):
     category_id: Optional[UUID] = None
-    amount: Optional[float] = None
+    amount: Optional[Money] = None
     note: Optional[str] = None
+
+
+class ExpenseImportRow(SQLModel):
+    # either the category id or its name
+    category_id: Optional[UUID] = None
+    category: Optional[str] = None
+    amount: Money
+    date: Optional[datetime] = None
+    note: Optional[str] = Field(default=None, max_length=250)
+
+    @field_validator("date")
+    @classmethod
+    def naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # the column is naive; "...Z" / "...-05:00" are stored as UTC rather
+        # than losing their offset (and maybe landing in another day or month)
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class ExpenseFilter(BaseModel):
+    category: Optional[str] = None
+    month: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    min_amount: Optional[Money] = None
+    max_amount: Optional[Money] = None
+
+
+class ExpenseSelection(BaseModel):
+    # ids, a filter, or both (combined with AND)
+    ids: Optional[list[UUID]] = Field(default=None, max_length=1000)
+    filter: Optional[ExpenseFilter] = None
+
+
+class ExpenseBatchUpdate(ExpenseSelection):
+    category_id: Optional[UUID] = None
+    note: Optional[str] = Field(default=None, max_length=250)
@@ -0,0 +1,35 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Annotated
+from pydantic import Field, PlainSerializer
+
+# amounts are stored as integer cents in BIGINT columns; this keeps every
+# accepted amount well inside that range
+MAX_AMOUNT = Decimal("1000000000000")
+
+# API-facing amount: parsed as a Decimal (so 0.1 stays 0.1) and written back
+# to JSON as a number, as the float fields were
+Money = Annotated[
+    Decimal,
+    Field(gt=-MAX_AMOUNT, lt=MAX_AMOUNT),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
+
+
+# read side: integer cents as loaded from the database, written to JSON as
+# the decimal amount (1250 -> 12.5) without building a Decimal per row
+Cents = Annotated[
+    int,
+    PlainSerializer(lambda cents: cents / 100, return_type=float, when_used="json"),
+]
+
+
+def to_cents(amount: Decimal | int | float) -> int:
+    """decimal amount -> integer cents, half-cents rounded away from zero"""
+    if isinstance(amount, float):
+        amount = Decimal(str(amount))
+    return int((amount * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> Decimal:
+    """integer cents -> decimal amount with two places, e.g. 1250 -> 12.50"""
+    return Decimal(cents).scaleb(-2)
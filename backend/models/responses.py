@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+
+class Message(BaseModel):
+    message: str
@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger
+from sqlmodel import SQLModel, Field
+from datetime import date
+from uuid import UUID
+
+
+class MonthlySpend(SQLModel, table=True):
+    """
+    Running total of a user's expenses per category per calendar month.
+    Maintained by the expense write routes in the same transaction as the
+    expense rows themselves; see services/rollup.py.
+    """
+
+    user_id: UUID = Field(foreign_key="user.id", ondelete="CASCADE", primary_key=True)
+    category_id: UUID = Field(
+        foreign_key="category.id", ondelete="CASCADE", primary_key=True
+    )
+    # first day of the month
+    month: date = Field(primary_key=True)
+    # integer cents, summed exactly
+    total_cents: int = Field(default=0, sa_type=BigInteger)
+    expense_count: int = Field(default=0)
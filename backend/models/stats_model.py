@@ -0,0 +1,29 @@
+from datetime import date
+from typing import Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel
+from models.money import Cents
+
+StatsPeriod = Literal["day", "week", "month"]
+
+
+class SpendingSeries(BaseModel):
+    # one value per entry of ExpenseStats.periods; change is against the
+    # previous period and null for the first one
+    category_id: Optional[UUID] = None
+    category: Optional[str] = None
+    totals: list[Cents]
+    counts: list[int]
+    running_totals: list[Cents]
+    changes: list[Optional[Cents]]
+    change_percents: list[Optional[float]]
+
+
+class ExpenseStats(BaseModel):
+    period: StatsPeriod
+    start_date: date
+    end_date: date
+    # first day of each day / week (Monday) / month in the range, no gaps
+    periods: list[date]
+    total: SpendingSeries
+    categories: list[SpendingSeries]
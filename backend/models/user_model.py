@@ -22,6 +22,8 @@ class User(SQLModel, table=True):
     hashed_password: str
     role: Role = Field(default=Role.user)
     created_at: datetime = Field(default_factory=datetime.now)
+    # bumped on every expense / category / budget write, see services.versions
+    data_version: int = Field(default=0)
     categories: list["Category"] = Relationship(
         back_populates="owner", cascade_delete=True
     )
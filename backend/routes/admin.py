@@ -2,8 +2,10 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlmodel import select
 from app import AsyncSession, get_session, raise_400_exception
-from auth import require_admin
-from models import User
+from auth import require_admin, invalidate_identity, auth_rate_limiter
+from models import User, Role
+from ai_agent.cache import agent_response_cache
+from ai_agent.limiter import agent_run_limiter
 
 router = APIRouter(prefix="/admin", tags=["admin control"])
 
@@ -21,5 +23,42 @@ async def admin_delete_user(
 
     await session.delete(user)
     await session.commit()
+    invalidate_identity(user_id)
 
     return {"message": f"User {user_id} deleted successfully"}
+
+
+@router.put(path="/users/{user_id}/role", description="admin change a user's role")
+async def admin_update_role(
+    user_id: UUID,
+    role: Role,
+    _: User = Depends(require_admin),
+    session: AsyncSession = Depends(get_session),
+):
+    user = (await session.exec(select(User).where(User.id == user_id))).first()
+
+    if not user:
+        raise raise_400_exception(detail=f"User with id {user_id} does not exist")
+
+    user.role = role
+
+    session.add(user)
+    await session.commit()
+    invalidate_identity(user_id)
+
+    return {"id": user.id, "role": user.role}
+
+
+@router.get(path="/rate-limits", description="sign in / sign up rate limiter counters")
+async def admin_rate_limits(_: User = Depends(require_admin)):
+    return auth_rate_limiter.stats()
+
+
+@router.get(path="/agent-cache", description="agent answer cache size and hit rate")
+async def admin_agent_cache(_: User = Depends(require_admin)):
+    return agent_response_cache.stats()
+
+
+@router.get(path="/agent-limiter", description="agent run slots, queue depth and waits")
+async def admin_agent_limiter(_: User = Depends(require_admin)):
+    return agent_run_limiter.stats()
@@ -1,20 +1,59 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import select, func, col
-from datetime import datetime
-from app import get_session, AsyncSession, raise_400_exception
-from models import Budget, User, BudgetCreate, Category, Expenses
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import select, func, col, and_
+from uuid import UUID
+from datetime import date
+from app import (
+    get_session,
+    get_read_session,
+    AsyncSession,
+    raise_400_exception,
+    resolve_period,
+    is_calendar_month,
+    get_settings,
+    Settings,
+)
+from models import (
+    Budget,
+    User,
+    BudgetCreate,
+    Category,
+    Expenses,
+    MonthlySpend,
+    BudgetRead,
+    BudgetForecast,
+    Message,
+    Money,
+    to_cents,
+    from_cents,
+)
 from auth import get_current_user
+from routes.conditional import data_version_etag
+from services import bump_data_version, sum_cents, forecast_month_end
 
+settings: Settings = get_settings()
 router = APIRouter(prefix="/budget", tags=["budgets"])
 
 
-@router.get(path="", description="get all budget limits")
+@router.get(
+    path="",
+    description="get all budget limits",
+    response_model=list[BudgetRead] | Message,
+    dependencies=[Depends(data_version_etag)],
+)
 async def get_budgets(
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     budgets = (
-        await session.exec(select(Budget).where(Budget.user_id == current_user.id))
+        await session.exec(
+            select(
+                Budget.id,
+                Budget.user_id,
+                Budget.category_id,
+                Budget.monthly_limit_cents,
+                Budget.created_at,
+            ).where(Budget.user_id == current_user.id)
+        )
     ).all()
 
     if len(budgets) == 0:
@@ -56,24 +95,27 @@ async def set_monthly_budget(
         )
 
     budget = Budget(
-        **budget_create.model_dump(), user_id=current_user.id, owner=current_user
+        **budget_create.model_dump(exclude={"monthly_limit"}),
+        monthly_limit_cents=to_cents(budget_create.monthly_limit),
+        user_id=current_user.id,
     )
 
     session.add(budget)
+    await bump_data_version(session, current_user.id)
     await session.commit()
     await session.refresh(budget)
 
     return {
         "id": budget.id,
-        "budget": budget.monthly_limit,
+        "budget": from_cents(budget.monthly_limit_cents),
         "category_id": budget.category_id,
     }
 
 
 @router.put(path="/update/{budget_id}", description="update the budget for category")
 async def update_budget(
-    budget_id: str,
-    new_monthly_limit: float,
+    budget_id: UUID,
+    new_monthly_limit: Money,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
@@ -87,53 +129,100 @@ async def update_budget(
     if not budget_exists:
         raise raise_400_exception(detail="Budget does not exists")
 
-    budget_exists.monthly_limit = new_monthly_limit
+    budget_exists.monthly_limit_cents = to_cents(new_monthly_limit)
 
     session.add(budget_exists)
+    await bump_data_version(session, current_user.id)
     await session.commit()
     await session.refresh(budget_exists)
 
-    return {"new_budget": budget_exists.monthly_limit}
+    return {"new_budget": from_cents(budget_exists.monthly_limit_cents)}
 
 
 @router.get(
     path="/summary",
-    description="get summary by total spending - budget for the current month",
+    description="get summary by total spending - budget for a month (defaults to the current month) or a date range",
+    dependencies=[Depends(data_version_etag)],
 )
 async def get_summary(
+    month: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    now = datetime.now()
+    start, end = resolve_period(month=month, start_date=start_date, end_date=end_date)
+
+    # one round-trip: budgets left joined to their category and to whatever
+    # holds the spending for the period, summed per budget. Whole calendar
+    # months read the monthly rollup (one row per category), other ranges
+    # aggregate the raw expenses.
+    if is_calendar_month(start, end):
+        spent = func.coalesce(sum_cents(MonthlySpend.total_cents), 0)
+        spending = MonthlySpend
+        on = and_(
+            col(MonthlySpend.category_id) == Budget.category_id,
+            col(MonthlySpend.user_id) == current_user.id,
+            col(MonthlySpend.month) == start.date(),
+        )
+    else:
+        spent = func.coalesce(sum_cents(Expenses.amount_cents), 0)
+        spending = Expenses
+        on = and_(
+            col(Expenses.category_id) == Budget.category_id,
+            col(Expenses.user_id) == current_user.id,
+            col(Expenses.date) >= start,
+            col(Expenses.date) < end,
+        )
 
-    budgets = (
-        await session.exec(select(Budget).where(Budget.user_id == current_user.id))
+    rows = (
+        await session.exec(
+            select(
+                Budget.category_id,
+                Category.name,
+                Budget.monthly_limit_cents,
+                spent,
+            )
+            .join(Category, col(Category.id) == Budget.category_id, isouter=True)
+            .join(spending, on, isouter=True)
+            .where(Budget.user_id == current_user.id)
+            .group_by(
+                col(Budget.id),
+                Budget.category_id,
+                Category.name,
+                Budget.monthly_limit_cents,
+            )
+            .order_by(Category.name)
+        )
     ).all()
 
-    if not budgets:
+    if not rows:
         return {"message": "No budgets set. Create a budget first."}
 
-    summary = []
-    for budget in budgets:
-        spent = (
-            await session.exec(
-                select(func.sum(Expenses.amount)).where(
-                    Expenses.category_id == budget.category_id,
-                    Expenses.user_id == current_user.id,
-                    func.extract("month", col(Expenses.date)) == now.month,
-                    func.extract("year", col(Expenses.date)) == now.year,
-                )
-            )
-        ).one()
-
-        total_spent = spent or 0.0
-        summary.append(
-            {
-                "category_id": budget.category_id,
-                "monthly_limit": budget.monthly_limit,
-                "spent": total_spent,
-                "remaining": budget.monthly_limit - total_spent,
-            }
-        )
+    # everything is summed and compared in integer cents, converted last
+    return [
+        {
+            "category_id": category_id,
+            "category_name": category_name,
+            "monthly_limit": from_cents(limit_cents),
+            "spent": from_cents(spent_cents),
+            "remaining": from_cents(limit_cents - spent_cents),
+            "status": "over" if spent_cents > limit_cents else "under",
+        }
+        for category_id, category_name, limit_cents, spent_cents in rows
+    ]
 
-    return summary
+
+@router.get(
+    path="/forecast",
+    description="project each category's spending to the end of this month and flag budgets it would exceed",
+    response_model=BudgetForecast,
+)
+async def get_forecast(
+    months: int = Query(default=settings.forecast_history_months, ge=1, le=24),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+):
+    # no ETag: the projection moves with the day of the month, not only
+    # with the user's data
+    return await forecast_month_end(session, current_user.id, history_months=months)
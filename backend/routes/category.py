@@ -1,20 +1,39 @@
 from fastapi import APIRouter, Depends, status
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from uuid import UUID
-from app import get_session, AsyncSession, raise_400_exception
-from models import Category, CategoryCreate, User
+from app import get_session, get_read_session, AsyncSession, raise_400_exception
+from models import (
+    Category,
+    CategoryCreate,
+    CategoryRead,
+    Message,
+    User,
+    normalize_category_name,
+)
 from auth import get_current_user
+from routes.conditional import data_version_etag
+from services import forget_category, bump_data_version, invalidate_category_map
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 
-@router.get(path="", description="get all categories by current user")
+@router.get(
+    path="",
+    description="get all categories by current user",
+    response_model=list[CategoryRead] | Message,
+    dependencies=[Depends(data_version_etag)],
+)
 async def get_categories(
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     categories = (
-        await session.exec(select(Category).where(Category.user_id == current_user.id))
+        await session.exec(
+            select(
+                Category.id, Category.user_id, Category.name, Category.created_at
+            ).where(Category.user_id == current_user.id)
+        )
     ).all()
 
     if len(categories) == 0:
@@ -31,10 +50,12 @@ async def create_category(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> dict[str, str]:
+    normalized_name = normalize_category_name(category_data.name)
     category_exist = (
         await session.exec(
-            select(Category).where(
-                Category.name == category_data.name, Category.user_id == current_user.id
+            select(Category.id).where(
+                Category.user_id == current_user.id,
+                Category.normalized_name == normalized_name,
             )
         )
     ).first()
@@ -42,12 +63,21 @@ async def create_category(
         raise raise_400_exception(detail="Category with this name already exists!")
 
     category = Category(
-        name=category_data.name, user_id=current_user.id, owner=current_user
+        name=category_data.name,
+        normalized_name=normalized_name,
+        user_id=current_user.id,
     )
 
     session.add(category)
-    await session.commit()
+    await bump_data_version(session, current_user.id)
+    try:
+        await session.commit()
+    except IntegrityError:
+        # a concurrent request created the same name first
+        await session.rollback()
+        raise raise_400_exception(detail="Category with this name already exists!")
     await session.refresh(category)
+    invalidate_category_map(current_user.id)
 
     return {"id": str(category.id), "name": category.name}
 
@@ -69,6 +99,9 @@ async def delete_category(
         raise raise_400_exception(detail=f"Category with this id {id} does not exists")
 
     await session.delete(category_exists)
+    await forget_category(session, category_exists.id)
+    await bump_data_version(session, current_user.id)
     await session.commit()
+    invalidate_category_map(current_user.id)
 
     return {"message": f"Category {id} deleted successfully"}
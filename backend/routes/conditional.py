@@ -0,0 +1,71 @@
+import hashlib
+from datetime import datetime
+from fastapi import Depends, Request, Response
+from app import AsyncSession, get_read_session, raise_304_exception
+from auth import get_current_user
+from models import User
+from services import get_data_version
+
+# part of every ETag; bump it when a response shape changes so clients
+# holding bodies in the old shape refetch them
+REPRESENTATION_VERSION = 1
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """weak comparison against an If-None-Match list, as RFC 9110 asks for"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+async def current_data_version(
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+) -> int:
+    """
+    The user's data version, read once per request: routes that also need it
+    (e.g. for the category map) depend on this and share the lookup with
+    data_version_etag.
+    """
+    return await get_data_version(session, current_user.id)
+
+
+async def data_version_etag(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    version: int = Depends(current_data_version),
+) -> str:
+    """
+    Conditional GET for reads that only depend on the user's own data. The
+    ETag is the user's data version plus a hash of the URL, so it changes on
+    any write and differs per query string. A matching If-None-Match ends the
+    request with 304 after this single version lookup. Shares the route's
+    read session, so version and data come from the same database.
+    """
+    # the month is in there for reads that default to "this month"
+    representation = "|".join(
+        (
+            str(REPRESENTATION_VERSION),
+            str(current_user.id),
+            request.url.path,
+            str(sorted(request.query_params.multi_items())),
+            datetime.now().strftime("%Y-%m"),
+        )
+    )
+    digest = hashlib.blake2b(representation.encode(), digest_size=8).hexdigest()
+    etag = f'"{version}-{digest}"'
+
+    headers = {
+        "ETag": etag,
+        # clients may keep the body but must revalidate before using it
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        raise raise_304_exception(headers=headers)
+
+    response.headers.update(headers)
+    return etag
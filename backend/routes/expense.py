@@ -1,47 +1,370 @@
-from fastapi import APIRouter, Depends, status
-from sqlmodel import select, func
-from app import AsyncSession, get_session, raise_400_exception
+import base64
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Literal
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, delete, false, tuple_, update
+from sqlmodel import select, col
+from app import (
+    AsyncSession,
+    get_session,
+    get_read_session,
+    raise_400_exception,
+    raise_413_exception,
+    resolve_period,
+    month_bounds,
+    current_month_bounds,
+    get_settings,
+    Settings,
+)
 from auth import get_current_user
-from models import Category, Expenses, User, ExpenseCreate, ExpenseUpdate
+from models import (
+    Category,
+    Expenses,
+    ExpenseRead,
+    ExpensePage,
+    User,
+    Money,
+    to_cents,
+    from_cents,
+    ExpenseCreate,
+    ExpenseUpdate,
+    ExpenseSelection,
+    ExpenseBatchUpdate,
+    ExpenseStats,
+    StatsPeriod,
+)
+from routes.conditional import current_data_version, data_version_etag
+from services import (
+    record_expense,
+    move_expense,
+    RollupDeltas,
+    rollup_deltas_of,
+    update_expenses_returning_old,
+    apply_rollup_deltas,
+    ImportPayloadError,
+    import_max_bytes,
+    parse_import_payload,
+    import_expense_rows,
+    bump_data_version,
+    resolve_category,
+    MAX_STATS_PERIODS,
+    period_axis,
+    spending_stats,
+)
 
+settings: Settings = get_settings()
 router = APIRouter(prefix="/expenses", tags=["expenses"])
 
 
-@router.get(path="", description="get all expenses for current user")
+SORT_COLUMNS = {"date": Expenses.date, "amount": Expenses.amount_cents}
+
+# the fields of ExpenseRead; list endpoints select these as plain rows instead
+# of loading ORM instances
+EXPENSE_READ_COLUMNS = (
+    Expenses.id,
+    Expenses.user_id,
+    Expenses.category_id,
+    Expenses.amount_cents,
+    Expenses.date,
+    Expenses.note,
+)
+
+
+# amount cursors must bind to the BIGINT cents column
+MAX_CURSOR_CENTS = 2**63 - 1
+
+
+def _encode_cursor(sort_by: str, value: datetime | int, id: UUID) -> str:
+    raw = value.isoformat() if isinstance(value, datetime) else value
+    payload = json.dumps([sort_by, raw, str(id)]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def _decode_cursor(cursor: str, sort_by: str) -> tuple[datetime | int, UUID]:
+    # cursors come back from clients, so anything may have been tampered with
+    try:
+        cursor_sort, raw, id = json.loads(base64.urlsafe_b64decode(cursor))
+        if cursor_sort != sort_by:
+            raise ValueError("cursor was issued for a different sort")
+        if not isinstance(id, str):
+            raise ValueError("the id is a UUID string")
+        if sort_by == "amount":
+            if type(raw) is not int or not -MAX_CURSOR_CENTS <= raw <= MAX_CURSOR_CENTS:
+                raise ValueError("amount cursors carry integer cents")
+            value = raw
+        else:
+            value = datetime.fromisoformat(raw)
+            if value.tzinfo is not None:
+                raise ValueError("expense dates are naive")
+        return value, UUID(id)
+    except (ValueError, TypeError):
+        raise raise_400_exception(detail="Invalid pagination cursor")
+
+
+async def _expense_filters(
+    session: AsyncSession,
+    user_id: UUID,
+    category: str | None = None,
+    month: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    min_amount: Money | None = None,
+    max_amount: Money | None = None,
+    data_version: int | None = None,
+) -> list:
+    """
+    WHERE clauses shared by the expense list/filter endpoints. `data_version`
+    saves the category lookup a query when the route already read it.
+    """
+    filters: list = [Expenses.user_id == user_id]
+
+    if category:
+        # usually answered by the cached category map, without a query
+        category_id = await resolve_category(session, user_id, category, data_version)
+        filters.append(
+            false() if category_id is None else Expenses.category_id == category_id
+        )
+    if month or start_date or end_date:
+        start, end = resolve_period(
+            month=month, start_date=start_date, end_date=end_date
+        )
+        filters.extend([col(Expenses.date) >= start, col(Expenses.date) < end])
+    if min_amount is not None:
+        filters.append(col(Expenses.amount_cents) >= to_cents(min_amount))
+    if max_amount is not None:
+        filters.append(col(Expenses.amount_cents) <= to_cents(max_amount))
+
+    return filters
+
+
+@router.get(
+    path="",
+    description="list expenses for current user, one page at a time (keyset pagination)",
+    response_model=ExpensePage,
+    dependencies=[Depends(data_version_etag)],
+)
 async def get_all_expenses(
     category: str | None = None,
+    month: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    min_amount: Money | None = None,
+    max_amount: Money | None = None,
+    sort_by: Literal["date", "amount"] = "date",
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
+    data_version: int = Depends(current_data_version),
 ):
-    if category:
-        category_id = (
-            await session.exec(
-                select(Category.id).where(
-                    func.lower(Category.name) == category.lower(),
-                    Category.user_id == current_user.id,
-                )
-            )
-        ).first()
+    filters = await _expense_filters(
+        session,
+        current_user.id,
+        category=category,
+        month=month,
+        start_date=start_date,
+        end_date=end_date,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        data_version=data_version,
+    )
 
-        filtered_expenses = (
-            await session.exec(
-                select(Expenses).where(
-                    Expenses.category_id == category_id,
-                    Expenses.user_id == current_user.id,
-                )
-            )
-        ).all()
+    # (sort column, id) is unique, so seeking past the last row of the previous
+    # page never skips or repeats rows and never needs an OFFSET scan
+    sort_column = col(SORT_COLUMNS[sort_by])
+    key = tuple_(sort_column, col(Expenses.id))
+    if cursor:
+        value, last_id = _decode_cursor(cursor, sort_by)
+        filters.append(
+            key < (value, last_id) if order == "desc" else key > (value, last_id)
+        )
 
-        return filtered_expenses
+    ordering = (
+        [sort_column.desc(), col(Expenses.id).desc()]
+        if order == "desc"
+        else [sort_column.asc(), col(Expenses.id).asc()]
+    )
 
+    # one extra row tells us whether there is another page
     expenses = (
-        await session.exec(select(Expenses).where(Expenses.user_id == current_user.id))
+        await session.exec(
+            select(*EXPENSE_READ_COLUMNS)
+            .where(*filters)
+            .order_by(*ordering)
+            .limit(limit + 1)
+        )
     ).all()
 
-    if len(expenses) == 0:
-        return {"message": "You dont have any expenses yet"}
+    next_cursor = None
+    if len(expenses) > limit:
+        expenses = expenses[:limit]
+        last = expenses[-1]
+        value = last.date if sort_by == "date" else last.amount_cents
+        next_cursor = _encode_cursor(sort_by, value, last.id)
 
-    return expenses
+    # rows go to the response model as they are; pydantic-core validates and
+    # writes them straight to JSON bytes
+    return {"expenses": expenses, "next_cursor": next_cursor}
+
+
+EXPORT_COLUMNS = ["id", "date", "amount", "category", "note"]
+EXPORT_CHUNK_SIZE = 1000
+
+
+async def _export_rows(request: Request, statement) -> AsyncIterator[Sequence[Row]]:
+    """yield the export rows chunk by chunk from a server-side cursor"""
+    # the request-scoped session may be closed before the response finishes
+    # streaming, so the export owns its own session for the whole stream
+    async with request.app.state.async_read_session() as session:
+        result = await session.stream(
+            statement.execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        async for chunk in result.partitions():
+            yield chunk
+
+
+async def _csv_chunks(rows: AsyncIterator[Sequence[Row]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for chunk in rows:
+        writer.writerows(
+            (
+                expense_id,
+                spent_at.isoformat(),
+                from_cents(amount_cents),
+                category or "",
+                note or "",
+            )
+            for expense_id, spent_at, amount_cents, category, note in chunk
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def _ndjson_chunks(rows: AsyncIterator[Sequence[Row]]) -> AsyncIterator[str]:
+    async for chunk in rows:
+        yield "".join(
+            json.dumps(
+                {
+                    "id": str(expense_id),
+                    "date": spent_at.isoformat(),
+                    # the exact decimal as a string, written as in the CSV
+                    "amount": str(from_cents(amount_cents)),
+                    "category": category,
+                    "note": note,
+                }
+            )
+            + "\n"
+            for expense_id, spent_at, amount_cents, category, note in chunk
+        )
+
+
+@router.get(
+    path="/export",
+    description="stream the full expense history (with category names) as CSV or NDJSON",
+)
+async def export_expenses(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    category: str | None = None,
+    month: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    current_user: User = Depends(get_current_user),
+    # only for resolving the category; closed before the body streams
+    session: AsyncSession = Depends(get_read_session, scope="function"),
+):
+    filters = await _expense_filters(
+        session,
+        current_user.id,
+        category=category,
+        month=month,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    statement = (
+        select(
+            Expenses.id,
+            Expenses.date,
+            Expenses.amount_cents,
+            Category.name,
+            Expenses.note,
+        )
+        .join(Category, col(Category.id) == Expenses.category_id, isouter=True)
+        .where(*filters)
+        .order_by(col(Expenses.date), col(Expenses.id))
+    )
+
+    rows = _export_rows(request, statement)
+    if format == "ndjson":
+        body, media_type = _ndjson_chunks(rows), "application/x-ndjson"
+    else:
+        body, media_type = _csv_chunks(rows), "text/csv"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="expenses.{format}"'},
+    )
+
+
+@router.get(
+    path="/stats",
+    description="spending per day / week / month and category, with running totals and changes",
+    response_model=ExpenseStats,
+    dependencies=[Depends(data_version_etag)],
+)
+async def get_expense_stats(
+    period: StatsPeriod = "month",
+    category: str | None = None,
+    month: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+    data_version: int = Depends(current_data_version),
+):
+    if month or start_date or end_date:
+        start, end = resolve_period(
+            month=month, start_date=start_date, end_date=end_date
+        )
+    else:
+        # the last 12 calendar months, this one included
+        this_month, end = current_month_bounds()
+        year, month_index = divmod(this_month.year * 12 + this_month.month - 12, 12)
+        start, _ = month_bounds(year, month_index + 1)
+    first_day, last_day = start.date(), (end - timedelta(days=1)).date()
+
+    axis = period_axis(period, first_day, last_day)
+    if len(axis) > MAX_STATS_PERIODS:
+        raise raise_400_exception(
+            detail=f"Range too long: at most {MAX_STATS_PERIODS} {period}s per request"
+        )
+
+    filters = await _expense_filters(
+        session,
+        current_user.id,
+        category=category,
+        start_date=first_day,
+        end_date=last_day,
+        data_version=data_version,
+    )
+    stats = await spending_stats(
+        session, current_user.id, filters, period, axis, data_version
+    )
+    return {"start_date": first_day, "end_date": last_day, **stats}
 
 
 @router.post(
@@ -51,7 +374,7 @@ async def create_expense(
     expense_data: ExpenseCreate,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-):
+) -> ExpenseRead:
     # Verify the category exists AND belongs to the current user
     category = (
         await session.exec(
@@ -68,24 +391,188 @@ async def create_expense(
         )
 
     expense = Expenses(
-        **expense_data.model_dump(),
+        **expense_data.model_dump(exclude={"amount"}),
+        amount_cents=to_cents(expense_data.amount),
         user_id=current_user.id,
-        owner=current_user,
     )
 
     session.add(expense)
+    await record_expense(session, expense)
+    await bump_data_version(session, current_user.id)
     await session.commit()
     await session.refresh(expense)
 
-    return expense
+    return ExpenseRead.model_validate(expense)
+
+
+async def _read_import_body(request: Request) -> bytes:
+    """
+    The request body, refused with 413 as soon as it is larger than the row
+    limit allows: up front from Content-Length, otherwise while streaming.
+    """
+    max_rows = settings.expense_import_max_rows
+    max_bytes = import_max_bytes(max_rows)
+    too_large = raise_413_exception(
+        detail=f"Body too large, an import takes at most {max_rows} rows ({max_bytes} bytes)"
+    )
+
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+
+@router.post(
+    path="/import",
+    description=(
+        "bulk import expenses from a JSON array or a CSV file (Content-Type: text/csv) "
+        "with the columns category_id or category, amount, date, note"
+    ),
+    status_code=status.HTTP_201_CREATED,
+)
+async def import_expenses(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        raw_rows = parse_import_payload(
+            await _read_import_body(request), request.headers.get("content-type", "")
+        )
+    except ImportPayloadError as error:
+        raise raise_400_exception(detail=str(error))
+
+    if len(raw_rows) > settings.expense_import_max_rows:
+        raise raise_400_exception(
+            detail=f"Too many rows, the limit is {settings.expense_import_max_rows} per import"
+        )
+
+    imported, errors = await import_expense_rows(session, current_user.id, raw_rows)
+    await bump_data_version(session, current_user.id)
+    await session.commit()
+
+    return {"imported": imported, "failed": len(errors), "errors": errors}
+
+
+async def _selection_filters(
+    session: AsyncSession, user_id: UUID, selection: ExpenseSelection
+) -> list:
+    if not selection.ids and not selection.filter:
+        raise raise_400_exception(detail="Provide expense ids, a filter, or both")
+
+    filters = [Expenses.user_id == user_id]
+    if selection.filter:
+        criteria = selection.filter.model_dump(exclude_none=True)
+        if not criteria:
+            raise raise_400_exception(detail="The filter must set at least one field")
+        filters = await _expense_filters(session, user_id, **criteria)
+    if selection.ids:
+        filters.append(col(Expenses.id).in_(selection.ids))
+
+    return filters
+
+
+@router.patch(
+    path="/batch",
+    description="recategorise or re-note many expenses, selected by ids and/or a filter",
+)
+async def batch_update_expenses(
+    batch: ExpenseBatchUpdate,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    changes = batch.model_dump(include={"category_id", "note"}, exclude_unset=True)
+    if not changes:
+        raise raise_400_exception(detail="Nothing to update, set category_id or note")
+
+    filters = await _selection_filters(session, current_user.id, batch)
+
+    if "category_id" in changes:
+        category = (
+            await session.exec(
+                select(Category.id).where(
+                    Category.id == changes["category_id"],
+                    Category.user_id == current_user.id,
+                )
+            )
+        ).first()
+        if not category:
+            raise raise_400_exception(
+                detail="Category not found. Please select a valid category or create one first."
+            )
+
+        # update (and lock) the matched rows in one statement, then move
+        # their totals from the old (category, month) buckets to the new
+        # category in the same months; previously uncategorised rows come in
+        # under a None category, which only gets added
+        rows = await update_expenses_returning_old(session, filters, changes)
+        deltas: RollupDeltas = defaultdict(lambda: (0, 0))
+        for (old_category_id, month), (total, count) in rollup_deltas_of(rows).items():
+            old_total, old_count = deltas[(old_category_id, month)]
+            deltas[(old_category_id, month)] = (old_total - total, old_count - count)
+            new_total, new_count = deltas[(changes["category_id"], month)]
+            deltas[(changes["category_id"], month)] = (
+                new_total + total,
+                new_count + count,
+            )
+        await apply_rollup_deltas(session, current_user.id, dict(deltas))
+        updated = len(rows)
+    else:
+        result = await session.exec(
+            update(Expenses)
+            .where(*filters)
+            .values(**changes)
+            .execution_options(synchronize_session=False)
+        )
+        updated = result.rowcount
+
+    await bump_data_version(session, current_user.id)
+    await session.commit()
+
+    return {"updated": updated}
+
+
+@router.delete(
+    path="/batch", description="delete many expenses, selected by ids and/or a filter"
+)
+async def batch_delete_expenses(
+    selection: ExpenseSelection,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    filters = await _selection_filters(session, current_user.id, selection)
+
+    # the rollup loses exactly what this statement deleted, whatever a
+    # concurrent request changed or deleted first
+    removed = (
+        await session.exec(
+            delete(Expenses)
+            .where(*filters)
+            .returning(Expenses.category_id, Expenses.date, Expenses.amount_cents)
+            .execution_options(synchronize_session=False)
+        )
+    ).all()
+    await apply_rollup_deltas(
+        session, current_user.id, rollup_deltas_of(removed, sign=-1)
+    )
+    await bump_data_version(session, current_user.id)
+    await session.commit()
+
+    return {"deleted": len(removed)}
 
 
 @router.get(path="/{id}")
 async def get_expense_by_id(
-    id: str,
+    id: UUID,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> Expenses:
+) -> ExpenseRead:
     expense = (
         await session.exec(
             select(Expenses).where(
@@ -97,55 +584,91 @@ async def get_expense_by_id(
     if not expense:
         raise raise_400_exception(detail="This expense does not exists! Create first")
 
-    return expense
+    return ExpenseRead.model_validate(expense)
 
 
 @router.put(path="/{id}", description="update specific expense by id")
 async def update_expense(
-    id: str,
+    id: UUID,
     expense_update: ExpenseUpdate,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-):
+) -> ExpenseRead:
+    # locked, so a concurrent edit or delete cannot change the old values the
+    # rollup is corrected by
     expense_exists = (
         await session.exec(
-            select(Expenses).where(
-                Expenses.id == id, Expenses.user_id == current_user.id
-            )
+            select(Expenses)
+            .where(Expenses.id == id, Expenses.user_id == current_user.id)
+            .with_for_update()
         )
     ).first()
     if not expense_exists:
         raise raise_400_exception(detail="This expense does not exists")
 
     to_update_expense = expense_update.model_dump(exclude_unset=True)
+    if "amount" in to_update_expense:
+        to_update_expense["amount_cents"] = to_cents(to_update_expense.pop("amount"))
+
+    if "category_id" in to_update_expense:
+        category = (
+            await session.exec(
+                select(Category.id).where(
+                    Category.id == to_update_expense["category_id"],
+                    Category.user_id == current_user.id,
+                )
+            )
+        ).first()
+        if not category:
+            raise raise_400_exception(
+                detail="Category not found. Please select a valid category or create one first."
+            )
+
+    old_category_id, old_amount_cents, old_date = (
+        expense_exists.category_id,
+        expense_exists.amount_cents,
+        expense_exists.date,
+    )
 
     for key, items in to_update_expense.items():
         setattr(expense_exists, key, items)
 
     session.add(expense_exists)
+    await move_expense(
+        session,
+        expense_exists,
+        old_category_id=old_category_id,
+        old_amount_cents=old_amount_cents,
+        old_date=old_date,
+    )
+    await bump_data_version(session, current_user.id)
     await session.commit()
     await session.refresh(expense_exists)
 
-    return expense_exists
+    return ExpenseRead.model_validate(expense_exists)
 
 
 @router.delete(path="/{id}")
 async def delete_expense(
-    id: str,
+    id: UUID,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
+    # locked, so a concurrent edit or delete cannot change the old values the
+    # rollup is corrected by
     expense_exists = (
         await session.exec(
-            select(Expenses).where(
-                Expenses.id == id, Expenses.user_id == current_user.id
-            )
+            select(Expenses)
+            .where(Expenses.id == id, Expenses.user_id == current_user.id)
+            .with_for_update()
         )
     ).first()
     if not expense_exists:
         raise raise_400_exception(detail="This expense does not exists")
 
     await session.delete(expense_exists)
+    await record_expense(session, expense_exists, sign=-1)
+    await bump_data_version(session, current_user.id)
     await session.commit()
 
     return {"message": "Expense deleted successfully"}
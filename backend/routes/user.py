@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from sqlmodel import select
 from app import get_session, AsyncSession
 from models import User, UserCreate
 from app import raise_400_exception, get_settings, Settings
 from auth import (
-    encrypt_password,
-    verify_password,
+    encrypt_password_async,
+    verify_password_async,
     create_jwt_token,
     get_current_user,
     create_refresh_token,
     decode_refresh_jwt_token,
+    token_claims,
+    enforce_auth_rate_limit,
 )
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
 from datetime import timedelta
@@ -28,8 +30,12 @@ router = APIRouter(prefix="/users", tags=["authentication"])
     path="/create", description="create a user", status_code=status.HTTP_201_CREATED
 )
 async def create_user(
-    user_data: UserCreate, session: AsyncSession = Depends(get_session)
+    request: Request,
+    user_data: UserCreate,
+    session: AsyncSession = Depends(get_session),
 ):
+    enforce_auth_rate_limit(request, user_data.email)
+
     user_exists = (
         await session.exec(select(User).where(User.email == user_data.email))
     ).first()
@@ -39,7 +45,7 @@ async def create_user(
     user = User(
         name=user_data.name,
         email=user_data.email,
-        hashed_password=encrypt_password(plain_password=user_data.password),
+        hashed_password=await encrypt_password_async(plain_password=user_data.password),
     )
 
     session.add(user)
@@ -51,24 +57,28 @@ async def create_user(
 
 @router.post(path="/token", description="sign in user")
 async def sign_in(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: AsyncSession = Depends(get_session),
 ):
     """check if the user exists and validate credentials"""
+    enforce_auth_rate_limit(request, form_data.username)
+
     user = (
         await session.exec(select(User).where(User.email == form_data.username))
     ).first()
-    if not user or not verify_password(
+    if not user or not await verify_password_async(
         plain_password=form_data.password, hashed_password=user.hashed_password
     ):
         raise raise_400_exception(detail="Invalid Credentials")
 
     "sign jwt token"
+    claims = token_claims(user)
     access_token = create_jwt_token(
-        data={"sub": user.email}, expires=timedelta(minutes=settings.token_expire_time)
+        data=claims, expires=timedelta(minutes=settings.token_expire_time)
     )
 
-    refresh_token = create_refresh_token(data={"sub": user.email})
+    refresh_token = create_refresh_token(data=claims)
 
     return {
         "access_token": access_token,
@@ -86,9 +96,9 @@ async def get_refresh_access_token(request: RefreshRequest):
     if payload.get("type") != "refresh":
         raise raise_400_exception(detail="Access token being used here")
 
-    email: str | None = payload.get("sub")
+    claims = {key: payload[key] for key in ("sub", "uid") if payload.get(key)}
 
-    new_access_token = create_jwt_token(data={"sub": email})
+    new_access_token = create_jwt_token(data=claims)
 
     return {"access_token": new_access_token, "type": "bearer"}
 
@@ -0,0 +1,63 @@
+from services.rollup import (
+    RollupDeltas,
+    month_start,
+    month_bucket,
+    period_bucket,
+    sum_cents,
+    apply_rollup_deltas,
+    record_expense,
+    move_expense,
+    rollup_deltas_of,
+    update_expenses_returning_old,
+    forget_category,
+    rebuild_rollup,
+    verify_rollup,
+)
+from services.expense_import import (
+    ImportPayloadError,
+    import_max_bytes,
+    parse_import_payload,
+    import_expense_rows,
+)
+from services.versions import bump_data_version, get_data_version
+from services.categories import (
+    CategoryMap,
+    category_maps,
+    get_category_map,
+    resolve_category,
+    invalidate_category_map,
+)
+from services.stats import MAX_STATS_PERIODS, period_axis, spending_stats
+from services.forecast import project_month_end, forecast_month_end
+
+__all__ = [
+    "RollupDeltas",
+    "month_start",
+    "month_bucket",
+    "period_bucket",
+    "sum_cents",
+    "apply_rollup_deltas",
+    "record_expense",
+    "move_expense",
+    "rollup_deltas_of",
+    "update_expenses_returning_old",
+    "forget_category",
+    "rebuild_rollup",
+    "verify_rollup",
+    "ImportPayloadError",
+    "import_max_bytes",
+    "parse_import_payload",
+    "import_expense_rows",
+    "bump_data_version",
+    "get_data_version",
+    "CategoryMap",
+    "category_maps",
+    "get_category_map",
+    "resolve_category",
+    "invalidate_category_map",
+    "MAX_STATS_PERIODS",
+    "period_axis",
+    "spending_stats",
+    "project_month_end",
+    "forecast_month_end",
+]
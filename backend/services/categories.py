@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from uuid import UUID
+from sqlmodel import select
+from app import AsyncSession, Settings, get_settings, TTLCache
+from models import Category, normalize_category_name
+from services.versions import get_data_version
+
+settings: Settings = get_settings()
+
+
+@dataclass(slots=True)
+class CategoryMap:
+    """
+    one user's categories: normalised name -> id and id -> display name, as
+    of the user's data version `version`
+    """
+
+    version: int
+    ids: dict[str, UUID]
+    names: dict[UUID, str]
+
+    def resolve(self, name: str) -> UUID | None:
+        return self.ids.get(normalize_category_name(name))
+
+
+# per worker. Every category write bumps the user's data version, so a map
+# built at an older version is reloaded, whichever worker made the change.
+category_maps: TTLCache[UUID, CategoryMap] = TTLCache(
+    maxsize=settings.category_cache_size, ttl=settings.category_cache_ttl
+)
+
+
+async def get_category_map(
+    session: AsyncSession, user_id: UUID, data_version: int | None = None
+) -> CategoryMap:
+    """
+    The user's category map, from the cache while it matches the user's
+    current data version. Pass `data_version` when the caller already read
+    it (see routes.conditional), otherwise it is looked up here.
+    """
+    if data_version is None:
+        data_version = await get_data_version(session, user_id)
+
+    cached = category_maps.get(user_id)
+    if cached is not None and cached.version == data_version:
+        return cached
+
+    # the version is read before the categories, so the map is never older
+    # than the version it is stored under
+    rows = (
+        await session.exec(
+            select(Category.id, Category.name, Category.normalized_name).where(
+                Category.user_id == user_id
+            )
+        )
+    ).all()
+    category_map = CategoryMap(
+        version=data_version,
+        ids={normalized: category_id for category_id, _, normalized in rows},
+        names={category_id: name for category_id, name, _ in rows},
+    )
+    category_maps.set(user_id, category_map)
+    return category_map
+
+
+async def resolve_category(
+    session: AsyncSession, user_id: UUID, name: str, data_version: int | None = None
+) -> UUID | None:
+    """id of the user's category called `name` (any case / spacing)"""
+    category_map = await get_category_map(session, user_id, data_version)
+    return category_map.resolve(name)
+
+
+def invalidate_category_map(user_id: UUID) -> None:
+    category_maps.pop(user_id)
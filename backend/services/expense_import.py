@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Any
+from uuid import UUID, uuid4
+from pydantic import ValidationError
+from sqlalchemy import insert
+from app import AsyncSession
+from models import Expenses, ExpenseImportRow, to_cents
+from services.categories import get_category_map
+from services.rollup import RollupDeltas, apply_rollup_deltas, month_start
+
+IMPORT_CHUNK_SIZE = 1000
+
+# generous upper bound on one valid row as JSON or CSV: a 250 character note
+# is at most 1500 bytes even fully \u-escaped, the other fields fit in the rest
+IMPORT_ROW_MAX_BYTES = 2048
+
+
+def import_max_bytes(max_rows: int) -> int:
+    """largest request body that can hold `max_rows` valid rows"""
+    # one extra row's worth for the CSV header / JSON brackets
+    return (max_rows + 1) * IMPORT_ROW_MAX_BYTES
+
+
+class ImportPayloadError(ValueError):
+    """the payload as a whole could not be read"""
+
+
+def parse_import_payload(body: bytes, content_type: str) -> list[dict[str, Any]]:
+    """turn a CSV (with a header row) or JSON array body into raw row dicts"""
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ImportPayloadError("Body must be UTF-8 encoded")
+
+    if "csv" in content_type:
+        # empty cells mean "not provided" rather than an empty string
+        return [
+            {
+                key: value
+                for key, value in row.items()
+                if key and value not in ("", None)
+            }
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+
+    try:
+        rows = json.loads(text)
+    except json.JSONDecodeError:
+        raise ImportPayloadError("Body must be a JSON array or CSV (text/csv)")
+
+    if not isinstance(rows, list):
+        raise ImportPayloadError("JSON body must be an array of expenses")
+    return rows
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+async def import_expense_rows(
+    session: AsyncSession, user_id: UUID, raw_rows: list[Any]
+) -> tuple[int, list[dict[str, Any]]]:
+    """
+    Validate and insert the rows, skipping (and reporting) the bad ones.
+    Returns the number of imported rows and the per-row errors; rows are
+    numbered from 1 in payload order. The caller commits.
+    """
+    # every category of the user, resolvable by id or by name
+    categories = await get_category_map(session, user_id)
+
+    errors: list[dict[str, Any]] = []
+    rows: list[dict[str, Any]] = []
+    deltas: RollupDeltas = defaultdict(lambda: (0, 0))
+    now = datetime.now()
+
+    for number, raw in enumerate(raw_rows, start=1):
+        try:
+            row = ExpenseImportRow.model_validate(raw)
+        except ValidationError as error:
+            errors.append({"row": number, "error": _describe(error)})
+            continue
+
+        if row.category_id is not None:
+            category_id = (
+                row.category_id if row.category_id in categories.names else None
+            )
+        elif row.category:
+            category_id = categories.resolve(row.category)
+        else:
+            errors.append(
+                {"row": number, "error": "category_id or category is required"}
+            )
+            continue
+
+        if category_id is None:
+            errors.append({"row": number, "error": "Category not found"})
+            continue
+
+        spent_at = row.date or now
+        amount_cents = to_cents(row.amount)
+        rows.append(
+            {
+                "id": uuid4(),
+                "user_id": user_id,
+                "category_id": category_id,
+                "amount_cents": amount_cents,
+                "date": spent_at,
+                "note": row.note,
+            }
+        )
+        key = (category_id, month_start(spent_at))
+        total, count = deltas[key]
+        deltas[key] = (total + amount_cents, count + 1)
+
+    # multi-row inserts, a chunk at a time, instead of one INSERT per expense
+    for start in range(0, len(rows), IMPORT_CHUNK_SIZE):
+        await session.exec(
+            insert(Expenses).values(rows[start : start + IMPORT_CHUNK_SIZE])
+        )
+
+    await apply_rollup_deltas(session, user_id, dict(deltas))
+
+    return len(rows), errors
@@ -0,0 +1,141 @@
+import calendar
+from datetime import date
+from typing import Any
+from uuid import UUID
+import numpy as np
+from sqlmodel import select, col, and_
+from app import AsyncSession
+from models import Budget, Category, MonthlySpend
+from services.rollup import month_start
+from services.stats import period_axis
+
+
+def _months_before(month: date, count: int) -> date:
+    year, month_index = divmod(month.year * 12 + month.month - 1 - count, 12)
+    return date(year, month_index + 1, 1)
+
+
+def project_month_end(
+    spent: np.ndarray, history: np.ndarray, elapsed: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    End-of-month projection for every category at once, in cents.
+
+    `spent` is the month-to-date spend per category and `history` the
+    (category x past month) totals, oldest first; `elapsed` is the share of
+    the month gone by. The rest of the month is expected to cost either the
+    current pace or whatever is left of the usual monthly total (nothing
+    once it is reached), weighted towards the pace as the month goes on.
+    Categories without history follow their pace. Returns (history
+    average, forecast).
+    """
+    active = history > 0
+    # months counted from each category's first spending in the window
+    started = active.any(axis=1)
+    months = np.where(started, history.shape[1] - active.argmax(axis=1), 0)
+    average = np.divide(
+        history.sum(axis=1),
+        months,
+        out=np.zeros(len(spent), dtype=float),
+        where=months > 0,
+    )
+
+    by_pace = spent / elapsed * (1 - elapsed)
+    by_history = np.maximum(average - spent, 0)
+    rest = np.where(started, elapsed * by_pace + (1 - elapsed) * by_history, by_pace)
+    forecast = spent + rest
+    return np.rint(average).astype(np.int64), np.rint(forecast).astype(np.int64)
+
+
+async def forecast_month_end(
+    session: AsyncSession,
+    user_id: UUID,
+    history_months: int,
+    today: date | None = None,
+) -> dict[str, Any]:
+    """
+    Project every category's spending to the end of the current month from
+    the monthly rollup: this month so far plus the `history_months` before
+    it, read in one query together with the budgets.
+    """
+    today = today or date.today()
+    this_month = month_start(today)
+    first_month = _months_before(this_month, history_months)
+    days_in_month = calendar.monthrange(today.year, today.month)[1]
+
+    rows = (
+        await session.exec(
+            select(
+                Category.id,
+                Category.name,
+                Budget.monthly_limit_cents,
+                MonthlySpend.month,
+                MonthlySpend.total_cents,
+            )
+            .join(Budget, col(Budget.category_id) == Category.id, isouter=True)
+            .join(
+                MonthlySpend,
+                and_(
+                    col(MonthlySpend.category_id) == Category.id,
+                    col(MonthlySpend.user_id) == user_id,
+                    col(MonthlySpend.month) >= first_month,
+                    col(MonthlySpend.month) <= this_month,
+                ),
+                isouter=True,
+            )
+            .where(Category.user_id == user_id)
+            .order_by(Category.name)
+        )
+    ).all()
+
+    # one entry per category, in name order
+    categories = {row[0]: (row[1], row[2]) for row in rows}
+    positions = {category_id: i for i, category_id in enumerate(categories)}
+    axis = period_axis("month", first_month, this_month)
+    totals = np.zeros((len(categories), len(axis)), dtype=np.int64)
+    spend_rows = [row for row in rows if row[3] is not None]
+    if spend_rows:
+        category_ids, _, _, months, month_totals = zip(*spend_rows)
+        np.add.at(
+            totals,
+            (
+                np.fromiter(
+                    (positions[category_id] for category_id in category_ids),
+                    dtype=np.intp,
+                    count=len(spend_rows),
+                ),
+                np.searchsorted(axis, np.array(months, dtype="datetime64[D]")),
+            ),
+            np.array(month_totals, dtype=np.int64),
+        )
+
+    spent = totals[:, -1]
+    average, forecast = project_month_end(
+        spent, totals[:, :-1], elapsed=today.day / days_in_month
+    )
+
+    entries = []
+    for i, (category_id, (name, limit_cents)) in enumerate(categories.items()):
+        remaining = None if limit_cents is None else limit_cents - int(forecast[i])
+        entries.append(
+            {
+                "category_id": category_id,
+                "category": name,
+                "monthly_limit_cents": limit_cents,
+                "spent_cents": int(spent[i]),
+                "history_average_cents": int(average[i]),
+                "forecast_cents": int(forecast[i]),
+                "forecast_remaining_cents": remaining,
+                "will_exceed": remaining is not None and remaining < 0,
+            }
+        )
+
+    return {
+        "month": this_month,
+        "days_elapsed": today.day,
+        "days_in_month": days_in_month,
+        "history_months": history_months,
+        "total_spent_cents": int(spent.sum()),
+        "total_forecast_cents": int(forecast.sum()),
+        "categories": entries,
+    }
@@ -0,0 +1,308 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+from sqlalchemy import BigInteger, Date, cast, delete, literal_column, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select, func, col
+from app import AsyncSession
+from models import Expenses, MonthlySpend
+
+# (category_id, month) -> (total delta in cents, count delta); uncategorised
+# expenses (category_id None) are not tracked and are skipped when applied
+RollupDeltas = dict[tuple[UUID | None, date], tuple[int, int]]
+
+
+def month_start(value: datetime | date) -> date:
+    return date(value.year, value.month, 1)
+
+
+# sqlite date() modifiers giving the first day of the period; weeks start on
+# Monday as with Postgres date_trunc('week', ...)
+_SQLITE_PERIOD_START = {
+    "day": (),
+    "week": ("weekday 0", "-6 days"),
+    "month": ("start of month",),
+}
+
+
+def period_bucket(column, period: str, dialect_name: str):
+    """SQL expression truncating a timestamp column to its day / week / month"""
+    if dialect_name == "sqlite":
+        return func.date(column, *_SQLITE_PERIOD_START[period])
+    # the unit is inlined: as a bind parameter the SELECT and GROUP BY copies
+    # would get different placeholders and Postgres would not match them
+    return cast(func.date_trunc(literal_column(f"'{period}'"), column), Date)
+
+
+def month_bucket(column, dialect_name: str):
+    """SQL expression truncating a timestamp column to the first of its month"""
+    return period_bucket(column, "month", dialect_name)
+
+
+def sum_cents(column):
+    """SUM of a cents column as BIGINT (Postgres widens SUM(bigint) to numeric)"""
+    return cast(func.sum(column), BigInteger)
+
+
+def _as_date(value: date | str) -> date:
+    # sqlite returns the truncated month as a string
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _insert_for(dialect_name: str):
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
+async def apply_rollup_deltas(
+    session: AsyncSession, user_id: UUID, deltas: RollupDeltas
+) -> None:
+    """
+    Add the deltas to the user's monthly rollup rows with a single upsert.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    rows = [
+        {
+            "user_id": user_id,
+            "category_id": category_id,
+            "month": month,
+            "total_cents": total,
+            "expense_count": count,
+        }
+        for (category_id, month), (total, count) in deltas.items()
+        if category_id is not None and (total or count)
+    ]
+    if not rows:
+        return
+
+    insert = _insert_for(session.get_bind().dialect.name)
+    statement = insert(MonthlySpend).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "category_id", "month"],
+        set_={
+            "total_cents": col(MonthlySpend.total_cents)
+            + statement.excluded.total_cents,
+            "expense_count": col(MonthlySpend.expense_count)
+            + statement.excluded.expense_count,
+        },
+    )
+    await session.exec(statement)
+
+
+async def record_expense(
+    session: AsyncSession, expense: Expenses, sign: int = 1
+) -> None:
+    """add (sign=1) or remove (sign=-1) a single expense from the rollup"""
+    if expense.category_id is None:
+        return
+
+    await apply_rollup_deltas(
+        session,
+        expense.user_id,
+        {
+            (expense.category_id, month_start(expense.date)): (
+                sign * expense.amount_cents,
+                sign,
+            )
+        },
+    )
+
+
+async def move_expense(
+    session: AsyncSession,
+    expense: Expenses,
+    old_category_id: UUID | None,
+    old_amount_cents: int,
+    old_date: datetime,
+) -> None:
+    """move an edited expense's contribution from its old bucket to its new one"""
+    deltas: RollupDeltas = defaultdict(lambda: (0, 0))
+
+    if old_category_id is not None:
+        key = (old_category_id, month_start(old_date))
+        total, count = deltas[key]
+        deltas[key] = (total - old_amount_cents, count - 1)
+
+    if expense.category_id is not None:
+        key = (expense.category_id, month_start(expense.date))
+        total, count = deltas[key]
+        deltas[key] = (total + expense.amount_cents, count + 1)
+
+    await apply_rollup_deltas(session, expense.user_id, dict(deltas))
+
+
+def rollup_deltas_of(rows, sign: int = 1) -> RollupDeltas:
+    """
+    Per (category, month) deltas of expense rows carrying category_id, date
+    and amount_cents, e.g. the ones a DELETE ... RETURNING took out (with
+    sign=-1). Includes a None category bucket for uncategorised expenses.
+    """
+    deltas: RollupDeltas = defaultdict(lambda: (0, 0))
+    for row in rows:
+        key = (row.category_id, month_start(row.date))
+        total, count = deltas[key]
+        deltas[key] = (total + sign * row.amount_cents, count + sign)
+    return dict(deltas)
+
+
+# expense ids per UPDATE on sqlite, see update_expenses_returning_old
+SQLITE_UPDATE_CHUNK = 5000
+
+
+async def update_expenses_returning_old(
+    session: AsyncSession, filters: list, values: dict[str, Any]
+) -> list:
+    """
+    Set `values` on the expenses matching the filters and return one row per
+    updated expense with its category_id from before the update, its date
+    and amount_cents, for rollup_deltas_of.
+
+    On Postgres this is one statement: the matched rows are locked in a
+    FOR UPDATE subquery which also carries their old category to RETURNING,
+    so no concurrent write can change them in between. sqlite cannot return
+    a joined table's columns, so the rows are read first and updated by id
+    in chunks; it only runs one write transaction at a time anyway.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        old = (
+            select(Expenses.id, Expenses.category_id)
+            .where(*filters)
+            .with_for_update()
+            .subquery("old")
+        )
+        return (
+            await session.exec(
+                update(Expenses)
+                .where(col(Expenses.id) == old.c.id)
+                .values(**values)
+                .returning(old.c.category_id, Expenses.date, Expenses.amount_cents)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+
+    rows = (
+        await session.exec(
+            select(
+                Expenses.id,
+                Expenses.category_id,
+                Expenses.date,
+                Expenses.amount_cents,
+            ).where(*filters)
+        )
+    ).all()
+    ids = [row.id for row in rows]
+    for i in range(0, len(ids), SQLITE_UPDATE_CHUNK):
+        await session.exec(
+            update(Expenses)
+            .where(col(Expenses.id).in_(ids[i : i + SQLITE_UPDATE_CHUNK]))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+    return rows
+
+
+async def forget_category(session: AsyncSession, category_id: UUID) -> None:
+    """
+    drop a deleted category's rollup rows; the FK cascade does the same on
+    Postgres, this keeps databases without enforced FKs consistent
+    """
+    await session.exec(
+        delete(MonthlySpend).where(col(MonthlySpend.category_id) == category_id)
+    )
+
+
+def _raw_totals_statement(dialect_name: str, user_id: UUID | None = None):
+    month = month_bucket(col(Expenses.date), dialect_name)
+    statement = (
+        select(
+            Expenses.user_id,
+            Expenses.category_id,
+            month,
+            sum_cents(Expenses.amount_cents),
+            func.count(),
+        )
+        .where(col(Expenses.category_id).is_not(None))
+        .group_by(col(Expenses.user_id), col(Expenses.category_id), month)
+    )
+    if user_id is not None:
+        statement = statement.where(Expenses.user_id == user_id)
+    return statement
+
+
+async def rebuild_rollup(session: AsyncSession, user_id: UUID | None = None) -> int:
+    """recompute the rollup from the raw expense rows, returns rows written"""
+    dialect_name = session.get_bind().dialect.name
+
+    clear = delete(MonthlySpend)
+    if user_id is not None:
+        clear = clear.where(col(MonthlySpend.user_id) == user_id)
+    await session.exec(clear)
+
+    rows = [
+        {
+            "user_id": row_user_id,
+            "category_id": category_id,
+            "month": _as_date(month),
+            "total_cents": total,
+            "expense_count": count,
+        }
+        for row_user_id, category_id, month, total, count in (
+            await session.exec(_raw_totals_statement(dialect_name, user_id))
+        ).all()
+    ]
+    if rows:
+        await session.exec(_insert_for(dialect_name)(MonthlySpend), params=rows)
+
+    await session.commit()
+    return len(rows)
+
+
+async def verify_rollup(
+    session: AsyncSession, user_id: UUID | None = None
+) -> list[dict]:
+    """compare the rollup against the raw expense rows and list every drift"""
+    dialect_name = session.get_bind().dialect.name
+
+    expected = {
+        (row_user_id, category_id, _as_date(month)): (total, count)
+        for row_user_id, category_id, month, total, count in (
+            await session.exec(_raw_totals_statement(dialect_name, user_id))
+        ).all()
+    }
+
+    stored_statement = select(
+        MonthlySpend.user_id,
+        MonthlySpend.category_id,
+        MonthlySpend.month,
+        MonthlySpend.total_cents,
+        MonthlySpend.expense_count,
+    )
+    if user_id is not None:
+        stored_statement = stored_statement.where(MonthlySpend.user_id == user_id)
+    stored = {
+        (row_user_id, category_id, month): (total, count)
+        for row_user_id, category_id, month, total, count in (
+            await session.exec(stored_statement)
+        ).all()
+    }
+
+    drift = []
+    for key in expected.keys() | stored.keys():
+        expected_total, expected_count = expected.get(key, (0, 0))
+        stored_total, stored_count = stored.get(key, (0, 0))
+        if expected_count != stored_count or expected_total != stored_total:
+            drift.append(
+                {
+                    "user_id": key[0],
+                    "category_id": key[1],
+                    "month": key[2],
+                    "expected_total_cents": expected_total,
+                    "stored_total_cents": stored_total,
+                    "expected_count": expected_count,
+                    "stored_count": stored_count,
+                }
+            )
+
+    return drift
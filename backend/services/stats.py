@@ -0,0 +1,126 @@
+from datetime import date
+from typing import Any
+from uuid import UUID
+import numpy as np
+from sqlmodel import select, func, col
+from app import AsyncSession
+from models import Expenses, StatsPeriod
+from services.categories import get_category_map
+from services.rollup import period_bucket, sum_cents
+
+# upper bound on the periods in one response (about 2.7 years of days)
+MAX_STATS_PERIODS = 1000
+
+
+def period_axis(period: StatsPeriod, start: date, end: date) -> np.ndarray:
+    """first day of every period touching [start, end], as datetime64[D]"""
+    if period == "month":
+        months = np.arange(
+            np.datetime64(start, "M"), np.datetime64(end, "M") + np.timedelta64(1, "M")
+        )
+        return months.astype("datetime64[D]")
+
+    first = np.datetime64(start, "D")
+    step = 1
+    if period == "week":
+        # back to Monday; day 0 of datetime64 (1970-01-01) was a Thursday
+        first -= np.timedelta64((first.astype(np.int64) + 3) % 7, "D")
+        step = 7
+    return np.arange(
+        first,
+        np.datetime64(end, "D") + np.timedelta64(1, "D"),
+        np.timedelta64(step, "D"),
+    )
+
+
+def _series_arrays(values: np.ndarray) -> dict[str, np.ndarray]:
+    """running totals and change against the previous period, row-wise"""
+    changes = np.diff(values, axis=1)
+    previous = values[:, :-1]
+    percents = np.full(changes.shape, np.nan)
+    np.divide(changes * 100.0, previous, out=percents, where=previous != 0)
+
+    # the first period has nothing to compare against
+    first = np.full((values.shape[0], 1), None, dtype=object)
+    percents = np.round(percents, 2).astype(object)
+    percents[np.isnan(percents.astype(float))] = None
+    return {
+        "running_totals": np.cumsum(values, axis=1),
+        "changes": np.hstack([first, changes.astype(object)]),
+        "change_percents": np.hstack([first, percents]),
+    }
+
+
+async def spending_stats(
+    session: AsyncSession,
+    user_id: UUID,
+    filters: list,
+    period: StatsPeriod,
+    axis: np.ndarray,
+    data_version: int | None = None,
+) -> dict[str, Any]:
+    """
+    Spending per period and category over `axis` (see period_axis), from a
+    single GROUP BY. Periods without expenses are filled with zeros before
+    running totals and changes are computed for all series at once.
+    """
+    bucket = period_bucket(
+        col(Expenses.date), period, session.get_bind().dialect.name
+    ).label("bucket")
+    rows = (
+        await session.exec(
+            select(
+                bucket,
+                Expenses.category_id,
+                sum_cents(Expenses.amount_cents),
+                func.count(),
+            )
+            .where(*filters)
+            .group_by(bucket, Expenses.category_id)
+        )
+    ).all()
+
+    # category ids in first-seen order -> row of the matrices
+    category_ids = list(dict.fromkeys(row[1] for row in rows))
+    totals = np.zeros((len(category_ids), len(axis)), dtype=np.int64)
+    counts = np.zeros_like(totals)
+    if rows:
+        buckets, row_categories, row_totals, row_counts = zip(*rows)
+        # sqlite returns the bucket as an ISO string, Postgres as a date
+        columns = np.searchsorted(axis, np.array(buckets, dtype="datetime64[D]"))
+        positions = {category_id: i for i, category_id in enumerate(category_ids)}
+        category_rows = np.fromiter(
+            (positions[category_id] for category_id in row_categories),
+            dtype=np.intp,
+            count=len(rows),
+        )
+        np.add.at(totals, (category_rows, columns), np.array(row_totals))
+        np.add.at(counts, (category_rows, columns), np.array(row_counts))
+
+    # row 0 is the total over all categories
+    totals = np.vstack([totals.sum(axis=0), totals])
+    counts = np.vstack([counts.sum(axis=0), counts])
+    derived = _series_arrays(totals)
+
+    names = (await get_category_map(session, user_id, data_version)).names
+
+    series = [
+        {
+            "category_id": category_id,
+            "category": names.get(category_id) if category_id else None,
+            "totals": totals[i].tolist(),
+            "counts": counts[i].tolist(),
+            **{name: values[i].tolist() for name, values in derived.items()},
+        }
+        for i, category_id in enumerate([None, *category_ids])
+    ]
+    total, categories = series[0], series[1:]
+    # named categories alphabetically, uncategorised spending last
+    categories.sort(key=lambda s: (s["category"] is None, s["category"] or ""))
+
+    return {
+        "period": period,
+        "periods": axis.tolist(),
+        "total": total,
+        "categories": categories,
+    }
@@ -0,0 +1,25 @@
+from uuid import UUID
+from sqlalchemy import update
+from sqlmodel import select, col
+from app import AsyncSession
+from models import User
+
+
+async def bump_data_version(session: AsyncSession, user_id: UUID) -> None:
+    """
+    Mark the user's financial data as changed. Runs inside the caller's
+    transaction, so the new version becomes visible together with the write.
+    """
+    await session.exec(
+        update(User)
+        .where(col(User.id) == user_id)
+        .values(data_version=col(User.data_version) + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def get_data_version(session: AsyncSession, user_id: UUID) -> int:
+    version = (
+        await session.exec(select(User.data_version).where(User.id == user_id))
+    ).first()
+    return version or 0
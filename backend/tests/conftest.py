@@ -0,0 +1,82 @@
+"""
+Shared fixtures: the real app on a scratch SQLite database, its lifespan
+running, an in-process client and a signed-in user. Every test starts from
+empty tables and empty per-worker caches.
+"""
+
+import os
+import tempfile
+
+# settings are read at import time, so configure them before the app loads
+DATABASE_PATH = os.path.join(tempfile.gettempdir(), "finance_tests.db")
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + DATABASE_PATH
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("REFRESH_TOKEN_SECRET_KEY", "test-refresh-secret")
+os.environ.setdefault("REFRESH_ACCESS_TOKEN_EXPIRE_LIMIT", "7")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+# every test signs up and in from the same client address
+os.environ["AUTH_RATE_LIMIT_BURST"] = "1000"
+
+import httpx
+import pytest
+from sqlmodel import SQLModel
+from ai_agent import load_agent_runtime
+from ai_agent.cache import agent_response_cache
+from app.main import app
+from auth import identity_cache
+from benchmarks.stub_model import StubModel
+from services import category_maps
+
+TEST_EMAIL = "tester@example.com"
+TEST_PASSWORD = "test-password"
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+def clear_caches() -> None:
+    """start the next request as a freshly booted worker would"""
+    identity_cache.clear()
+    category_maps.clear()
+    agent_response_cache.clear()
+
+
+@pytest.fixture
+async def client():
+    if os.path.exists(DATABASE_PATH):
+        os.remove(DATABASE_PATH)
+
+    async with app.router.lifespan_context(app):
+        async with app.state.engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+
+    clear_caches()
+
+
+@pytest.fixture
+async def auth_headers(client: httpx.AsyncClient) -> dict[str, str]:
+    response = await client.post(
+        "/users/create",
+        json={"email": TEST_EMAIL, "password": TEST_PASSWORD, "name": "Tester"},
+    )
+    assert response.status_code == 201, response.text
+    response = await client.post(
+        "/users/token", data={"username": TEST_EMAIL, "password": TEST_PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+async def stub_agent():
+    """answer /agent/chat through the stub model instead of Gemini"""
+    runtime = await load_agent_runtime()
+    model = runtime.finance_agent.model
+    runtime.finance_agent.model = StubModel(latency=0)
+    yield
+    runtime.finance_agent.model = model
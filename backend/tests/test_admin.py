@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import delete, update
+from app.main import app
+from auth import decode_jwt_token
+from models import Role, User
+from tests.conftest import TEST_EMAIL
+
+pytestmark = pytest.mark.anyio
+
+
+async def set_role(role: Role) -> None:
+    """change the role behind the app's back, as another worker would"""
+    async with app.state.async_session() as session:
+        await session.exec(
+            update(User).where(User.email == TEST_EMAIL).values(role=role)
+        )
+        await session.commit()
+
+
+async def test_tokens_carry_no_role(auth_headers):
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    assert "role" not in decode_jwt_token(token=token)
+
+
+async def test_demoted_admin_loses_access_despite_cache(client, auth_headers):
+    await set_role(Role.admin)
+    response = await client.get("/admin/rate-limits", headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    # this worker's identity cache still holds the admin
+    await set_role(Role.user)
+    response = await client.get("/admin/rate-limits", headers=auth_headers)
+    assert response.status_code == 403
+
+
+async def test_promoted_user_gains_access_despite_cache(client, auth_headers):
+    response = await client.get("/admin/rate-limits", headers=auth_headers)
+    assert response.status_code == 403
+
+    await set_role(Role.admin)
+    response = await client.get("/admin/rate-limits", headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+
+async def test_deleted_admin_loses_access_despite_cache(client, auth_headers):
+    await set_role(Role.admin)
+    response = await client.get("/admin/agent-cache", headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    async with app.state.async_session() as session:
+        await session.exec(delete(User).where(User.email == TEST_EMAIL))
+        await session.commit()
+    response = await client.get("/admin/agent-cache", headers=auth_headers)
+    assert response.status_code == 401
@@ -0,0 +1,147 @@
+import asyncio
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+import ai_agent.route
+from ai_agent import load_agent_runtime
+from ai_agent.limiter import AgentRunLimiter
+from app.main import app
+from benchmarks.stub_model import StubModel
+from tests.conftest import clear_caches
+
+pytestmark = pytest.mark.anyio
+
+
+class PoolWatchingModel(StubModel):
+    """stub model noting how many pooled connections are out during each call"""
+
+    def __init__(self):
+        super().__init__(latency=0)
+        self.checked_out: list[int] = []
+
+    def _note(self) -> None:
+        self.checked_out.append(
+            sum(engine.pool.checkedout() for engine in app.state.engines.values())
+        )
+
+    async def get_response(self, *args, **kwargs):
+        self._note()
+        return await super().get_response(*args, **kwargs)
+
+    async def stream_response(self, *args, **kwargs):
+        self._note()
+        async for event in super().stream_response(*args, **kwargs):
+            yield event
+
+
+@pytest.fixture
+async def watching_model():
+    runtime = await load_agent_runtime()
+    model = runtime.finance_agent.model
+    runtime.finance_agent.model = PoolWatchingModel()
+    yield runtime.finance_agent.model
+    runtime.finance_agent.model = model
+
+
+async def test_chat_holds_no_connection_during_run(
+    client, auth_headers, watching_model
+):
+    # cold identity cache: the user is loaded from the database
+    clear_caches()
+
+    response = await client.post(
+        "/agent/chat", json={"message": "Am I over budget?"}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert watching_model.checked_out and set(watching_model.checked_out) == {0}
+
+
+async def test_stream_holds_no_connection_during_run(
+    client, auth_headers, watching_model
+):
+    clear_caches()
+
+    response = await client.post(
+        "/agent/stream", json={"message": "Am I over budget?"}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    events = [
+        line.removeprefix("event: ")
+        for line in response.text.splitlines()
+        if line.startswith("event: ")
+    ]
+    assert events[-1] == "done"
+    assert watching_model.checked_out and set(watching_model.checked_out) == {0}
+
+
+def small_limiter(queue_timeout: float = 5) -> AgentRunLimiter:
+    return AgentRunLimiter(
+        max_concurrent=1, per_user=1, max_queue=1, queue_timeout=queue_timeout
+    )
+
+
+async def test_limiter_rejects_a_second_run_per_user():
+    limiter = small_limiter()
+    user = uuid4()
+    permit = await limiter.acquire(user)
+
+    with pytest.raises(HTTPException) as error:
+        await limiter.acquire(user)
+    assert error.value.status_code == 429
+
+    permit.release()
+    (await limiter.acquire(user)).release()
+
+
+async def test_limiter_rejects_when_the_queue_is_full():
+    limiter = small_limiter()
+    permit = await limiter.acquire(uuid4())
+    queued = asyncio.create_task(limiter.acquire(uuid4()))
+    await asyncio.sleep(0)
+    assert limiter.stats()["queue_depth"] == 1
+
+    with pytest.raises(HTTPException) as error:
+        await limiter.acquire(uuid4())
+    assert error.value.status_code == 503
+    assert error.value.headers["Retry-After"] == "5"
+
+    # the queued run gets the slot once it is released
+    permit.release()
+    (await queued).release()
+    assert limiter.stats()["rejected_queue_full"] == 1
+    assert limiter.stats()["running"] == 0
+
+
+async def test_limiter_gives_up_after_the_queue_timeout():
+    limiter = small_limiter(queue_timeout=0.05)
+    permit = await limiter.acquire(uuid4())
+
+    with pytest.raises(HTTPException) as error:
+        await limiter.acquire(uuid4())
+    assert error.value.status_code == 503
+    assert limiter.stats()["timed_out"] == 1
+    assert limiter.stats()["queue_depth"] == 0
+
+    permit.release()
+
+
+async def test_chat_answers_503_when_the_assistant_is_busy(
+    client, auth_headers, watching_model, monkeypatch
+):
+    limiter = small_limiter(queue_timeout=0.05)
+    monkeypatch.setattr(ai_agent.route, "agent_run_limiter", limiter)
+    # another user's run holds the only slot
+    permit = await limiter.acquire(uuid4())
+
+    response = await client.post(
+        "/agent/chat", json={"message": "Am I over budget?"}, headers=auth_headers
+    )
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    assert watching_model.checked_out == []
+
+    permit.release()
+    response = await client.post(
+        "/agent/chat", json={"message": "Am I over budget?"}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
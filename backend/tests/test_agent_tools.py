@@ -0,0 +1,40 @@
+import json
+from types import SimpleNamespace
+import pytest
+from agents.tool_context import ToolContext
+from ai_agent.context import TOP_EXPENSES_CAP, TopExpense
+from ai_agent.tools import get_top_expenses
+
+pytestmark = pytest.mark.anyio
+
+
+async def top_expenses(count: int, limit: int) -> str:
+    snapshot = SimpleNamespace(
+        top_expenses=[
+            TopExpense(amount_cents=1000 - i, category_name="Food", note=None)
+            for i in range(count)
+        ]
+    )
+
+    async def load_snapshot():
+        return snapshot
+
+    context = ToolContext(
+        context=SimpleNamespace(snapshot=load_snapshot),
+        tool_name="get_top_expenses",
+        tool_call_id="call",
+        tool_arguments=json.dumps({"limit": limit}),
+    )
+    return await get_top_expenses.on_invoke_tool(context, json.dumps({"limit": limit}))
+
+
+async def test_top_expenses_within_cap():
+    output = await top_expenses(count=TOP_EXPENSES_CAP, limit=3)
+    assert output.startswith("Your top 3 expense(s)")
+    assert len(output.splitlines()) == 4
+
+
+async def test_top_expenses_over_cap_says_so():
+    output = await top_expenses(count=TOP_EXPENSES_CAP, limit=100)
+    assert f"at most {TOP_EXPENSES_CAP}, not the 100 asked for" in output
+    assert len(output.splitlines()) == TOP_EXPENSES_CAP + 1
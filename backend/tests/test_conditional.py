@@ -0,0 +1,57 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def category_id(client, auth_headers) -> str:
+    response = await client.post(
+        "/categories/create", json={"name": "Food"}, headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def revalidate(client, headers, path: str, etag: str):
+    return await client.get(path, headers={**headers, "If-None-Match": etag})
+
+
+@pytest.mark.parametrize("path", ["/budget/summary", "/expenses", "/categories"])
+async def test_write_changes_the_etag(client, auth_headers, category_id, path):
+    response = await client.get(path, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = await revalidate(client, auth_headers, path, etag)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    response = await client.post(
+        "/expenses/create",
+        json={"category_id": category_id, "amount": 9.99},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+
+    response = await revalidate(client, auth_headers, path, etag)
+    assert response.status_code == 200, response.text
+    assert response.headers["ETag"] != etag
+
+    response = await revalidate(client, auth_headers, path, response.headers["ETag"])
+    assert response.status_code == 304
+
+
+async def test_etag_differs_per_query_and_accepts_weak_lists(client, auth_headers):
+    first = await client.get("/expenses", params={"limit": 1}, headers=auth_headers)
+    second = await client.get("/expenses", params={"limit": 2}, headers=auth_headers)
+    assert first.headers["ETag"] != second.headers["ETag"]
+
+    response = await revalidate(
+        client,
+        auth_headers,
+        "/expenses?limit=1",
+        f'"other", W/{first.headers["ETag"]}',
+    )
+    assert response.status_code == 304
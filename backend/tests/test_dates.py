@@ -0,0 +1,44 @@
+from datetime import date, datetime
+import pytest
+from fastapi import HTTPException
+from app import resolve_period
+
+pytestmark = pytest.mark.anyio
+
+
+def test_resolve_period_end_date_is_inclusive():
+    assert resolve_period(start_date=date(2025, 2, 1), end_date=date(2025, 2, 28)) == (
+        datetime(2025, 2, 1),
+        datetime(2025, 3, 1),
+    )
+
+
+def test_resolve_period_month():
+    assert resolve_period(month="2024-12") == (
+        datetime(2024, 12, 1),
+        datetime(2025, 1, 1),
+    )
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"start_date": date(2020, 1, 1), "end_date": date.max},
+        {"month": "9999-12"},
+        {"month": "2025-13"},
+    ],
+)
+def test_resolve_period_out_of_range(params):
+    with pytest.raises(HTTPException) as error:
+        resolve_period(**params)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/budget/summary", "/expenses", "/expenses/stats"])
+@pytest.mark.parametrize(
+    "params",
+    [{"start_date": "2020-01-01", "end_date": "9999-12-31"}, {"month": "9999-12"}],
+)
+async def test_last_representable_day_is_rejected(client, auth_headers, path, params):
+    response = await client.get(path, params=params, headers=auth_headers)
+    assert response.status_code == 400, response.text
@@ -0,0 +1,41 @@
+import csv
+import io
+import json
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+# amounts that binary floats cannot hold exactly
+AMOUNTS = ["0.10", "0.20", "1234567.89", "19.99", "-0.07"]
+
+
+async def test_csv_and_ndjson_agree_on_amounts(client, auth_headers):
+    response = await client.post(
+        "/categories/create", json={"name": "Food"}, headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+    rows = [
+        {"category": "food", "amount": amount, "date": f"2025-01-0{i + 1}T12:00:00"}
+        for i, amount in enumerate(AMOUNTS)
+    ]
+    response = await client.post("/expenses/import", json=rows, headers=auth_headers)
+    assert response.json()["imported"] == len(AMOUNTS), response.text
+
+    response = await client.get(
+        "/expenses/export", params={"format": "csv"}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    from_csv = {
+        row["id"]: row["amount"] for row in csv.DictReader(io.StringIO(response.text))
+    }
+
+    response = await client.get(
+        "/expenses/export", params={"format": "ndjson"}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    from_ndjson = {
+        row["id"]: row["amount"] for row in map(json.loads, response.text.splitlines())
+    }
+
+    assert from_csv == from_ndjson
+    assert sorted(from_ndjson.values()) == sorted(AMOUNTS)
@@ -0,0 +1,86 @@
+import json
+import pytest
+from app import get_settings
+from app.main import app
+from services import verify_rollup
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def two_row_limit(monkeypatch):
+    # caps the body at (2 + 1) * IMPORT_ROW_MAX_BYTES
+    monkeypatch.setattr(get_settings(), "expense_import_max_rows", 2)
+
+
+async def test_import_within_limit(client, auth_headers, two_row_limit):
+    response = await client.post(
+        "/categories/create", json={"name": "Food"}, headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+
+    response = await client.post(
+        "/expenses/import",
+        content="category,amount\nfood,12.50\nfood,3\n",
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 201, response.text
+    assert response.json()["imported"] == 2
+
+
+async def test_import_too_large_by_content_length(client, auth_headers, two_row_limit):
+    body = json.dumps([{"category": "food", "amount": 1}] * 1000)
+
+    response = await client.post(
+        "/expenses/import",
+        content=body,
+        headers={**auth_headers, "Content-Type": "application/json"},
+    )
+    assert response.status_code == 413, response.text
+
+
+async def test_import_too_large_while_streaming(client, auth_headers, two_row_limit):
+    async def chunks():
+        # no Content-Length; the body is cut off once it passes the cap
+        for _ in range(100):
+            yield b"category,amount\n" * 100
+
+    response = await client.post(
+        "/expenses/import",
+        content=chunks(),
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 413, response.text
+
+
+async def test_import_stores_aware_dates_as_utc(client, auth_headers):
+    response = await client.post(
+        "/categories/create", json={"name": "Food"}, headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+
+    response = await client.post(
+        "/expenses/import",
+        json=[
+            {"category": "food", "amount": 1, "date": "2025-03-01T12:00:00Z"},
+            # late on 31 March in New York is already April in UTC
+            {"category": "food", "amount": 2, "date": "2025-03-31T23:30:00-05:00"},
+        ],
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    assert response.json() == {"imported": 2, "failed": 0, "errors": []}
+
+    response = await client.get(
+        "/expenses", params={"month": "2025-04"}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert [e["date"] for e in response.json()["expenses"]] == ["2025-04-01T04:30:00"]
+
+    response = await client.get(
+        "/expenses", params={"month": "2025-03"}, headers=auth_headers
+    )
+    assert [e["date"] for e in response.json()["expenses"]] == ["2025-03-01T12:00:00"]
+
+    async with app.state.async_session() as session:
+        assert await verify_rollup(session) == []
@@ -0,0 +1,110 @@
+import base64
+import json
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+SOME_ID = "6f1c0a52-1d0e-4a4e-9d55-2b1f3c3f6c01"
+
+
+def cursor_of(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.fixture
+async def expenses(client, auth_headers) -> list[dict]:
+    """eleven expenses, most sharing a timestamp or an amount with another"""
+    response = await client.post(
+        "/categories/create", json={"name": "Food"}, headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+
+    rows = [
+        {
+            "category": "food",
+            "amount": [5, 5, 5, 12.5, 12.5, 20, 20, 20, 20, 3, 7][i],
+            "date": ["2025-03-01T12:00:00", "2025-03-02T08:00:00"][i % 2],
+        }
+        for i in range(11)
+    ]
+    response = await client.post("/expenses/import", json=rows, headers=auth_headers)
+    assert response.json()["imported"] == 11, response.text
+
+    response = await client.get(
+        "/expenses", params={"limit": 500}, headers=auth_headers
+    )
+    return response.json()["expenses"]
+
+
+async def walk(client, headers, **params) -> tuple[list[dict], int]:
+    """every page of GET /expenses, followed by next_cursor; returns (rows, pages)"""
+    rows, pages, cursor = [], 0, None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/expenses", params=query, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        rows += page["expenses"]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return rows, pages
+
+
+@pytest.mark.parametrize("sort_by", ["date", "amount"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_pages_have_no_duplicates_or_gaps(
+    client, auth_headers, expenses, sort_by, order
+):
+    rows, pages = await walk(
+        client, auth_headers, sort_by=sort_by, order=order, limit=3
+    )
+    assert pages == 4
+
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids)) == len(expenses)
+    assert set(ids) == {row["id"] for row in expenses}
+
+    # sorted by the column, ties broken by id in the same direction
+    keys = [(row[sort_by], row["id"]) for row in rows]
+    assert keys == sorted(keys, reverse=order == "desc")
+
+
+async def test_last_page_has_no_cursor(client, auth_headers, expenses):
+    response = await client.get("/expenses", params={"limit": 11}, headers=auth_headers)
+    assert len(response.json()["expenses"]) == 11
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64 at all!",
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        cursor_of({}),
+        cursor_of(["date", "2025-03-01T12:00:00"]),
+        cursor_of(["amount", "2025-03-01T12:00:00", SOME_ID]),
+        cursor_of(["date", 5, SOME_ID]),
+        cursor_of(["date", "yesterday", SOME_ID]),
+        cursor_of(["date", "2025-03-01T12:00:00+05:00", SOME_ID]),
+        cursor_of(["date", "2025-03-01T12:00:00", 5]),
+        cursor_of(["date", "2025-03-01T12:00:00", ["x"]]),
+        cursor_of(["date", "2025-03-01T12:00:00", "not-a-uuid"]),
+    ],
+)
+async def test_malformed_cursor_is_rejected(client, auth_headers, cursor):
+    response = await client.get(
+        "/expenses", params={"cursor": cursor}, headers=auth_headers
+    )
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Invalid pagination cursor"
+
+
+@pytest.mark.parametrize("raw", [12.5, True, 10**30, None])
+async def test_tampered_amount_cursor_is_rejected(client, auth_headers, raw):
+    response = await client.get(
+        "/expenses",
+        params={"sort_by": "amount", "cursor": cursor_of(["amount", raw, SOME_ID])},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400, response.text
@@ -0,0 +1,104 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def spending(client, auth_headers):
+    """a few expenses around new year; 30 Dec 2024 starts ISO week 1 of 2025"""
+    for name in ("Food", "Rent"):
+        response = await client.post(
+            "/categories/create", json={"name": name}, headers=auth_headers
+        )
+        assert response.status_code == 201, response.text
+
+    response = await client.post(
+        "/expenses/import",
+        json=[
+            {"category": "food", "amount": 10, "date": "2024-12-29T18:00:00"},
+            {"category": "food", "amount": 5, "date": "2024-12-30T09:00:00"},
+            {"category": "food", "amount": 15, "date": "2025-01-01T12:00:00"},
+            {"category": "rent", "amount": 100, "date": "2025-01-05T23:59:00"},
+            {"category": "food", "amount": 30, "date": "2025-01-07T07:30:00"},
+        ],
+        headers=auth_headers,
+    )
+    assert response.json()["imported"] == 5, response.text
+
+
+async def get_stats(client, headers, **params):
+    response = await client.get("/expenses/stats", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_weekly_series_across_new_year(client, auth_headers, spending):
+    stats = await get_stats(
+        client,
+        auth_headers,
+        period="week",
+        start_date="2024-12-28",
+        end_date="2025-01-12",
+    )
+
+    # weeks start on Monday; the middle one spans both years
+    assert stats["periods"] == ["2024-12-23", "2024-12-30", "2025-01-06"]
+
+    total = stats["total"]
+    assert total["totals"] == [10.0, 120.0, 30.0]
+    assert total["counts"] == [1, 3, 1]
+    assert total["running_totals"] == [10.0, 130.0, 160.0]
+    assert total["changes"] == [None, 110.0, -90.0]
+    assert total["change_percents"] == [None, 1100.0, -75.0]
+
+    food, rent = stats["categories"]
+    assert (food["category"], rent["category"]) == ("Food", "Rent")
+    assert food["totals"] == [10.0, 20.0, 30.0]
+    assert food["running_totals"] == [10.0, 30.0, 60.0]
+    assert food["changes"] == [None, 10.0, 10.0]
+    assert food["change_percents"] == [None, 100.0, 50.0]
+
+    assert rent["totals"] == [0.0, 100.0, 0.0]
+    assert rent["changes"] == [None, 100.0, -100.0]
+    # no percentage against an empty previous period
+    assert rent["change_percents"] == [None, None, -100.0]
+
+
+async def test_daily_and_monthly_buckets(client, auth_headers, spending):
+    daily = await get_stats(
+        client,
+        auth_headers,
+        period="day",
+        start_date="2024-12-29",
+        end_date="2025-01-01",
+    )
+    assert daily["periods"] == [
+        "2024-12-29",
+        "2024-12-30",
+        "2024-12-31",
+        "2025-01-01",
+    ]
+    assert daily["total"]["totals"] == [10.0, 5.0, 0.0, 15.0]
+    assert daily["total"]["running_totals"] == [10.0, 15.0, 15.0, 30.0]
+
+    monthly = await get_stats(
+        client,
+        auth_headers,
+        period="month",
+        start_date="2024-12-01",
+        end_date="2025-01-31",
+    )
+    assert monthly["periods"] == ["2024-12-01", "2025-01-01"]
+    assert monthly["total"]["totals"] == [15.0, 145.0]
+    assert monthly["total"]["counts"] == [2, 3]
+    assert monthly["total"]["changes"] == [None, 130.0]
+    # rounded to two places
+    assert monthly["total"]["change_percents"] == [None, 866.67]
+
+
+async def test_category_filter(client, auth_headers, spending):
+    stats = await get_stats(
+        client, auth_headers, period="month", month="2025-01", category="rent"
+    )
+    assert stats["total"]["totals"] == [100.0]
+    assert [s["category"] for s in stats["categories"]] == ["Rent"]
@@ -0,0 +1,102 @@
+from datetime import date
+from uuid import UUID
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from app import Settings
+from app.main import app
+from models import Budget
+from services import forecast_month_end, project_month_end
+
+pytestmark = pytest.mark.anyio
+
+
+def test_no_history_follows_the_pace():
+    average, forecast = project_month_end(
+        np.array([1000]), np.zeros((1, 6), dtype=np.int64), elapsed=0.25
+    )
+    assert average.tolist() == [0]
+    assert forecast.tolist() == [4000]
+
+
+def test_first_day_of_month_leans_on_history():
+    elapsed = 1 / 31
+    average, forecast = project_month_end(
+        np.array([0, 100]), np.array([[3000, 3000], [0, 0]]), elapsed=elapsed
+    )
+    assert average.tolist() == [3000, 0]
+    # nothing spent yet: almost all of the usual month is still to come;
+    # without history a day's spending is extrapolated over the month
+    assert forecast.tolist() == [round((1 - elapsed) * 3000), 3100]
+
+
+def test_spending_only_in_past_months():
+    # averaged from the first month with spending, not over the whole window
+    average, forecast = project_month_end(
+        np.array([0]), np.array([[0, 0, 3000, 6000]]), elapsed=0.5
+    )
+    assert average.tolist() == [4500]
+    assert forecast.tolist() == [2250]
+
+
+def test_history_reached_adds_nothing_more():
+    average, forecast = project_month_end(
+        np.array([5000]), np.array([[4000, 4000]]), elapsed=0.5
+    )
+    # half the pace-based rest (5000), nothing left of the 4000 average
+    assert forecast.tolist() == [5000 + 2500]
+
+
+@pytest.mark.parametrize("months", [0, 25])
+def test_history_months_setting_is_bounded(months):
+    with pytest.raises(ValidationError):
+        Settings(forecast_history_months=months)
+
+
+async def test_forecast_month_end_values(client, auth_headers):
+    for name in ("Food", "Rent"):
+        response = await client.post(
+            "/categories/create", json={"name": name}, headers=auth_headers
+        )
+        assert response.status_code == 201, response.text
+    response = await client.post(
+        "/expenses/import",
+        json=[
+            {"category": "food", "amount": 30, "date": "2025-01-10T12:00:00"},
+            {"category": "food", "amount": 60, "date": "2025-02-10T12:00:00"},
+            {"category": "rent", "amount": 10, "date": "2025-03-01T08:00:00"},
+        ],
+        headers=auth_headers,
+    )
+    assert response.json()["imported"] == 3, response.text
+    user_id = UUID((await client.get("/users/me", headers=auth_headers)).json()["id"])
+    categories = (await client.get("/categories", headers=auth_headers)).json()
+    food_id = next(UUID(c["id"]) for c in categories if c["name"] == "Food")
+
+    async with app.state.async_session() as session:
+        session.add(
+            Budget(user_id=user_id, category_id=food_id, monthly_limit_cents=4000)
+        )
+        await session.commit()
+        result = await forecast_month_end(
+            session, user_id, history_months=6, today=date(2025, 3, 1)
+        )
+
+    assert (result["days_elapsed"], result["days_in_month"]) == (1, 31)
+    food, rent = result["categories"]
+    assert (food["category"], rent["category"]) == ("Food", "Rent")
+
+    assert food["spent_cents"] == 0
+    assert food["history_average_cents"] == 4500
+    assert food["forecast_cents"] == round(30 / 31 * 4500)
+    assert food["forecast_remaining_cents"] == 4000 - round(30 / 31 * 4500)
+    assert food["will_exceed"] is True
+
+    assert rent["spent_cents"] == 1000
+    assert rent["history_average_cents"] == 0
+    assert rent["forecast_cents"] == 31000
+    assert rent["forecast_remaining_cents"] is None
+    assert rent["will_exceed"] is False
+
+    assert result["total_spent_cents"] == 1000
+    assert result["total_forecast_cents"] == round(30 / 31 * 4500) + 31000
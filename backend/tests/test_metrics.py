@@ -0,0 +1,35 @@
+import pytest
+from app import get_settings
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def metrics_token(monkeypatch) -> str:
+    monkeypatch.setattr(get_settings(), "metrics_token", "scrape-secret")
+    return "scrape-secret"
+
+
+async def test_metrics_disabled_without_a_token(client):
+    response = await client.get("/metrics")
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "authorization", [None, "Bearer wrong", "Basic scrape-secret", "scrape-secret"]
+)
+async def test_metrics_rejects_missing_or_wrong_token(
+    client, metrics_token, authorization
+):
+    headers = {"Authorization": authorization} if authorization else {}
+    response = await client.get("/metrics", headers=headers)
+    assert response.status_code == 401
+
+
+async def test_metrics_with_token(client, metrics_token):
+    await client.get("/health")
+    response = await client.get(
+        "/metrics", headers={"Authorization": f"Bearer {metrics_token}"}
+    )
+    assert response.status_code == 200, response.text
+    assert 'route="/health"' in response.text
@@ -0,0 +1,114 @@
+"""
+Query budgets per endpoint, so an N+1 or an extra round-trip fails here
+rather than in production. Each request is measured on cold per-worker
+caches (identity, category map, agent answers), i.e. the worst case.
+"""
+
+from uuid import UUID
+import httpx
+import pytest
+from app.main import app
+from models import Budget
+from app.testing import assert_query_budget
+from tests.conftest import clear_caches
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_data(client: httpx.AsyncClient, headers: dict[str, str]) -> None:
+    """a few categories, budgets and expenses, enough to expose per-row queries"""
+    budgets = []
+    for name, limit in [("Food", 300), ("Rent", 1000), ("Travel", None)]:
+        response = await client.post(
+            "/categories/create", json={"name": name}, headers=headers
+        )
+        assert response.status_code == 201, response.text
+        category_id = response.json()["id"]
+        if limit is not None:
+            budgets.append((UUID(category_id), limit * 100))
+        for amount in (12.5, 40, 7.25):
+            response = await client.post(
+                "/expenses/create",
+                json={"category_id": category_id, "amount": amount},
+                headers=headers,
+            )
+            assert response.status_code == 201, response.text
+
+    # BudgetCreate takes the category id as a string, which only Postgres
+    # binds to a UUID column; insert the budgets directly instead
+    user_id = (await client.get("/users/me", headers=headers)).json()["id"]
+    async with app.state.async_session() as session:
+        for category_id, limit_cents in budgets:
+            session.add(
+                Budget(
+                    user_id=UUID(user_id),
+                    category_id=category_id,
+                    monthly_limit_cents=limit_cents,
+                )
+            )
+        await session.commit()
+
+
+@pytest.mark.parametrize(
+    ("path", "params", "budget"),
+    [
+        # user, data version (ETag), rollup join
+        ("/budget/summary", {}, 3),
+        # user, data version (ETag), raw expenses for a custom range
+        ("/budget/summary", {"start_date": "2020-01-01", "end_date": "2030-12-31"}, 3),
+        # user, data version (ETag), one page
+        ("/expenses", {}, 3),
+        # plus the category map, on a cold cache
+        ("/expenses", {"category": "food"}, 4),
+        # user, data version (ETag), categories
+        ("/categories", {}, 3),
+        # user, data version (ETag), grouped spending, category map
+        ("/expenses/stats", {"period": "week"}, 4),
+        # user, categories + budgets + rollup history
+        ("/budget/forecast", {}, 2),
+    ],
+)
+async def test_read_query_budget(client, auth_headers, path, params, budget):
+    await create_data(client, auth_headers)
+    clear_caches()
+
+    with assert_query_budget(app, budget):
+        response = await client.get(path, params=params, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+
+async def test_not_modified_query_budget(client, auth_headers):
+    await create_data(client, auth_headers)
+    response = await client.get("/budget/summary", headers=auth_headers)
+    clear_caches()
+
+    # user and data version only; the summary itself is not computed
+    with assert_query_budget(app, 2):
+        response = await client.get(
+            "/budget/summary",
+            headers={**auth_headers, "If-None-Match": response.headers["ETag"]},
+        )
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize(
+    ("message", "budget"),
+    [
+        # user, data version (answer cache), spend snapshot, top expenses
+        ("Am I over budget?", 4),
+        # plus the month-end forecast
+        ("Can I afford a $500 phone?", 5),
+    ],
+)
+async def test_agent_chat_query_budget(
+    client, auth_headers, stub_agent, message, budget
+):
+    await create_data(client, auth_headers)
+    clear_caches()
+
+    with assert_query_budget(app, budget):
+        response = await client.post(
+            "/agent/chat", json={"message": message}, headers=auth_headers
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["cached"] is False
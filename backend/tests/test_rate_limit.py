@@ -0,0 +1,76 @@
+import pytest
+import auth.rate_limit
+from auth.rate_limit import TokenBucketLimiter
+from tests.conftest import TEST_EMAIL, TEST_PASSWORD
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(auth.rate_limit, "monotonic", clock)
+    return clock
+
+
+def test_bucket_refills_over_time(clock):
+    limiter = TokenBucketLimiter(capacity=2, rate=1 / 60, max_keys=10)
+    assert limiter.acquire("ip:a") == 0
+    assert limiter.acquire("ip:a") == 0
+    # empty: the next token is a minute away
+    assert limiter.acquire("ip:a") == pytest.approx(60)
+
+    clock.now += 30
+    assert limiter.acquire("ip:a") == pytest.approx(30)
+    clock.now += 30
+    assert limiter.acquire("ip:a") == 0
+    assert limiter.stats()["rejected"] == 2
+
+
+def test_every_key_must_have_a_token(clock):
+    limiter = TokenBucketLimiter(capacity=1, rate=1, max_keys=10)
+    assert limiter.acquire("ip:a", "user:x") == 0
+    # another user from the same address is held back by the ip bucket,
+    # and nothing is taken from the user's bucket on rejection
+    assert limiter.acquire("ip:a", "user:y") > 0
+    assert limiter.acquire("ip:b", "user:y") == 0
+
+
+def test_least_recently_used_keys_are_evicted(clock):
+    limiter = TokenBucketLimiter(capacity=1, rate=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        assert limiter.acquire(key) == 0
+    assert limiter.stats()["evicted"] == 1
+    # "a" was dropped, so it starts full again
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("c") > 0
+
+
+async def test_sign_in_answers_429_once_the_bucket_is_empty(
+    client, auth_headers, monkeypatch
+):
+    monkeypatch.setattr(
+        auth.rate_limit,
+        "auth_rate_limiter",
+        TokenBucketLimiter(capacity=2, rate=1 / 60, max_keys=100),
+    )
+
+    form = {"username": TEST_EMAIL, "password": "wrong-password"}
+    for _ in range(2):
+        response = await client.post("/users/token", data=form)
+        assert response.status_code == 400, response.text
+
+    # even the right password is refused until a token is back
+    response = await client.post(
+        "/users/token", data={"username": TEST_EMAIL, "password": TEST_PASSWORD}
+    )
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 59
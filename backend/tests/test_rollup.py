@@ -0,0 +1,94 @@
+"""
+The monthly rollup must match the raw expense rows after every kind of write.
+"""
+
+import httpx
+import pytest
+from app.main import app
+from services import verify_rollup
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_category(client: httpx.AsyncClient, headers, name: str) -> str:
+    response = await client.post(
+        "/categories/create", json={"name": name}, headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def create_expense(client: httpx.AsyncClient, headers, **fields) -> str:
+    response = await client.post("/expenses/create", json=fields, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def assert_no_drift() -> None:
+    async with app.state.async_session() as session:
+        assert await verify_rollup(session) == []
+
+
+async def test_single_writes_keep_rollup(client, auth_headers):
+    food = await create_category(client, auth_headers, "Food")
+    rent = await create_category(client, auth_headers, "Rent")
+    expense_id = await create_expense(client, auth_headers, category_id=food, amount=20)
+
+    response = await client.put(
+        f"/expenses/{expense_id}",
+        json={"category_id": rent, "amount": 35.5},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    await assert_no_drift()
+
+    response = await client.delete(f"/expenses/{expense_id}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    await assert_no_drift()
+
+    # deleting it again finds nothing and leaves the rollup alone
+    response = await client.delete(f"/expenses/{expense_id}", headers=auth_headers)
+    assert response.status_code == 400
+    await assert_no_drift()
+
+
+async def test_batch_writes_keep_rollup(client, auth_headers):
+    food = await create_category(client, auth_headers, "Food")
+    rent = await create_category(client, auth_headers, "Rent")
+    travel = await create_category(client, auth_headers, "Travel")
+    ids = [
+        await create_expense(client, auth_headers, category_id=food, amount=12.5),
+        await create_expense(client, auth_headers, category_id=food, amount=7),
+        await create_expense(client, auth_headers, category_id=rent, amount=900),
+        await create_expense(client, auth_headers, category_id=travel, amount=3),
+    ]
+
+    response = await client.patch(
+        "/expenses/batch",
+        json={"ids": [ids[0], ids[2], ids[3]], "category_id": food},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"updated": 3}
+    await assert_no_drift()
+
+    response = await client.patch(
+        "/expenses/batch",
+        json={"filter": {"category": "food"}, "note": "groceries"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"updated": 4}
+
+    response = await client.request(
+        "DELETE",
+        "/expenses/batch",
+        json={"filter": {"min_amount": 10}},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"deleted": 2}
+    await assert_no_drift()
+
+    response = await client.get("/budget/summary", headers=auth_headers)
+    assert response.status_code == 200, response.text
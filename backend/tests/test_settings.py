@@ -0,0 +1,12 @@
+import pytest
+from pydantic import ValidationError
+from app import Settings
+
+
+@pytest.mark.parametrize(
+    "field", ["auth_rate_limit_per_minute", "auth_rate_limit_burst"]
+)
+def test_auth_rate_limit_must_be_positive(field):
+    # a zero refill rate used to fail every sign in with ZeroDivisionError
+    with pytest.raises(ValidationError):
+        Settings(**{field: 0})